@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
-import json
 import os
 from logging_config import get_logger
+from file_functions import read_data_file
 
 logger = get_logger(__name__)
 
@@ -19,9 +19,7 @@ class Background:
         """Load background data from JSON file"""
         try:
             file_path = os.path.join("data", "backgrounds", f"{self.name.lower()}.json")
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            return data
+            return read_data_file(file_path)
         except Exception as e:
             logger.error(f"Failed to load background data for {self.name}: {e}")
             raise ValueError(f"Invalid background: {self.name}")
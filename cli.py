@@ -7,11 +7,15 @@ from logging_config import setup_logging, get_logger
 import json
 import sys
 import os
+import functools
 from typing import Dict, Optional
 import random
 
 logger = get_logger(__name__)
 
+RACE_DIR = os.path.join("data", "races")
+CLASS_DIR = os.path.join("data", "classes")
+
 def prompt_user(prompt: str, choices: Optional[list] = None) -> str:
     """Prompt user for input, optionally with numbered choices"""
     while True:
@@ -32,28 +36,27 @@ def prompt_user(prompt: str, choices: Optional[list] = None) -> str:
                 return value
             print("Value cannot be empty, please try again")
 
+@functools.lru_cache(maxsize=8)
+def _scan_json_dir(path: str, mtime_ns: int) -> tuple:
+    """List .json file names (without extension) in a directory
+    
+    The directory mtime is part of the cache key, so adding or removing
+    files invalidates the cached listing.
+    """
+    return tuple(file[:-5] for file in os.listdir(path) if file.endswith(".json"))
+
 def get_available_races() -> list:
     """Get list of available races from data directory"""
-    races = []
-    race_dir = os.path.join("data", "races")
-    for file in os.listdir(race_dir):
-        if file.endswith(".json"):
-            races.append(file[:-5])  # Remove .json extension
-    return races
+    return list(_scan_json_dir(RACE_DIR, os.stat(RACE_DIR).st_mtime_ns))
 
 def get_available_classes() -> list:
     """Get list of available classes from data directory"""
-    classes = []
-    class_dir = os.path.join("data", "classes")
-    for file in os.listdir(class_dir):
-        if file.endswith(".json"):
-            classes.append(file[:-5])  # Remove .json extension
-    return classes
+    return list(_scan_json_dir(CLASS_DIR, os.stat(CLASS_DIR).st_mtime_ns))
 
 def get_subraces(race: str) -> list:
     """Get available subraces for a given race"""
     try:
-        with open(os.path.join("data", "races", f"{race}.json")) as f:
+        with open(os.path.join(RACE_DIR, f"{race}.json")) as f:
             race_data = json.load(f)
             return [subrace["name"] for subrace in race_data.get("subraces", [])]
     except Exception:
@@ -577,9 +580,11 @@ def interactive_load_character():
                     print(f"  - {class_info['name']}: Level {class_info['level']}")
         
         # Save if any changes were made
-        if toon.properties['metadata']['save_count'] > 0 or True:  # Save regardless for now
+        if toon.has_unsaved_changes():
             toon.save()
             print("Character updated and saved")
+        else:
+            print("No changes to save")
         
         # Export options
         export_format = prompt_user(
@@ -777,7 +782,7 @@ def main():
     create_parser.add_argument("--background", help="Character background (e.g., acolyte, criminal)")
     create_parser.add_argument("--personality", help="Personality choices in JSON format (e.g., '{\"traits\": [\"trait1\", \"trait2\"], \"ideal\": \"ideal1\", \"bond\": \"bond1\", \"flaw\": \"flaw1\"}')")
     create_parser.add_argument("--export", choices=["text", "json", "html", "pdf"], 
-                             help="Export character sheet format (Note: PDF export requires pdftk to be installed)")
+                             help="Export character sheet format (Note: PDF export is flattened only when pdftk is installed)")
     
     # Load character command
     load_parser = subparsers.add_parser("load", help="Load an existing character")
@@ -0,0 +1,72 @@
+import pytest
+from dataclasses import dataclass, field
+import cli
+from toon import Toon
+
+ABILITIES = ('strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma')
+
+@pytest.fixture(scope="session")
+def base_toon_factory():
+    """Factory for fresh Toon instances, optionally with a race already applied"""
+    def _make(race=None, subrace=None, name=None):
+        toon = Toon()
+        if name:
+            toon.set_name(name)
+        if race:
+            toon.set_race(race, subrace)
+        return toon
+    return _make
+
+@pytest.fixture(scope="module")
+def standard_human(base_toon_factory):
+    """Standard human shared by a module; tests must not modify it"""
+    return base_toon_factory('human', 'Standard', name='Standard Human Test')
+
+@pytest.fixture(scope="module")
+def variant_human(base_toon_factory):
+    """Variant human shared by a module; tests must not modify it"""
+    return base_toon_factory('human', 'Variant', name='Variant Human Test')
+
+@dataclass(slots=True)
+class FakeToon:
+    """Lightweight stand-in for Toon backed by a plain properties dict
+    
+    Only implements the methods the CLI choice handlers call, with the same
+    semantics as Toon so pending choices drain as they are handled.
+    """
+    properties: dict = field(default_factory=dict)
+
+    def has_pending_choices(self) -> bool:
+        return bool(self.properties.get("pending_choices", {}))
+
+    def get_pending_choices(self) -> dict:
+        return self.properties.get("pending_choices", {})
+
+    def set_subclass(self, class_name: str, subclass_name: str):
+        self.properties.setdefault("subclass", {})[class_name] = subclass_name
+
+@pytest.fixture
+def fake_toon():
+    """Fresh FakeToon with empty properties"""
+    return FakeToon()
+
+@pytest.fixture(scope="session")
+def race_class_dirs(tmp_path_factory):
+    """Temporary data directory with a few empty race and class files"""
+    root = tmp_path_factory.mktemp("data")
+    (root / "races").mkdir()
+    (root / "classes").mkdir()
+    for name in ("elf", "dwarf"):
+        (root / "races" / f"{name}.json").touch()
+    for name in ("wizard", "fighter"):
+        (root / "classes" / f"{name}.json").touch()
+    yield root
+    cli._scan_json_dir.cache_clear()
+
+@pytest.fixture
+def with_pending(fake_toon):
+    """Arm fake_toon with pending choices and return the live pending dict"""
+    def _arm(pending: dict) -> dict:
+        fake_toon.properties["pending_choices"] = dict(pending)
+        return fake_toon.properties["pending_choices"]
+    return _arm
@@ -1,9 +1,17 @@
+import functools
 import json
+import mmap
+import pickle
 import random
 from os.path import isfile, join
-from os import listdir, remove, makedirs
+from os import remove, makedirs, scandir, stat, fstat
 from logging_config import get_logger
 
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used when missing
+    orjson = None
+
 logger = get_logger(__name__)
 
 PATHS = {
@@ -16,6 +24,18 @@ PATHS = {
 for directory in PATHS.values():
     makedirs(directory, exist_ok=True)
 
+# Files at least this large are memory-mapped and handed to orjson without an
+# intermediate read buffer; below it a plain read is cheaper than the mapping
+MMAP_THRESHOLD = 64 * 1024
+
+def _parse_json_file(filepath):
+    with open(filepath, 'rb') as fp:
+        if orjson is not None and fstat(fp.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        raw = fp.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 def save_file(dict, path_key, name_override=None):
     try:
         if not name_override:
@@ -26,8 +46,13 @@ def save_file(dict, path_key, name_override=None):
         filepath = f"{PATHS[path_key]}/{filename}.json"
         logger.debug(f"Saving file to: {filepath}")
         
-        with open(filepath, 'w') as fp:
-            json.dump(dict, fp)
+        if orjson is not None:
+            # Feature tables use int level keys, which orjson only accepts with OPT_NON_STR_KEYS
+            payload = orjson.dumps(dict, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(dict).encode()
+        with open(filepath, 'wb') as fp:
+            fp.write(payload)
             logger.info(f"Successfully saved file: {filepath}")
             
     except Exception as e:
@@ -43,10 +68,9 @@ def open_file(filename, path_key):
             raise FileNotFoundError(f"{filename} file does not exist")
             
         logger.debug(f"Opening file: {filepath}")
-        with open(filepath, 'r') as fp:
-            dict = json.load(fp)
-            logger.info(f"Successfully opened file: {filepath}")
-            return dict
+        dict = _parse_json_file(filepath)
+        logger.info(f"Successfully opened file: {filepath}")
+        return dict
             
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse JSON from {filepath}: {e}")
@@ -55,12 +79,38 @@ def open_file(filename, path_key):
         logger.error(f"Error opening file {filepath}: {e}")
         raise
 
+@functools.lru_cache(maxsize=256)
+def _load_json_snapshot(filepath, stamp):
+    """Read a JSON file once and keep it in a form that is cheap to copy
+    
+    With orjson, re-parsing the raw bytes is the fastest way to get a fresh
+    copy; otherwise the parsed data is kept pickled.
+    """
+    with open(filepath, 'rb') as fp:
+        raw = fp.read()
+    if orjson is not None:
+        orjson.loads(raw)  # fail on bad JSON now rather than on first use
+        return raw
+    return pickle.dumps(json.loads(raw), pickle.HIGHEST_PROTOCOL)
+
+def read_data_file(filepath):
+    """Load a static game data file (race, class, background, ...)
+    
+    The parsed file is cached per path and reloaded when its mtime or size
+    changes. Each call returns a fresh copy that the caller is free to modify.
+    """
+    st = stat(filepath)
+    snapshot = _load_json_snapshot(filepath, (st.st_mtime_ns, st.st_size))
+    return orjson.loads(snapshot) if orjson is not None else pickle.loads(snapshot)
+
 def list_files(path_key, file_type):
     try:
         directory = PATHS[path_key] + "/"
         logger.debug(f"Listing files in {directory} with type {file_type}")
         
-        files = [f for f in listdir(directory) if f.endswith(file_type)]
+        with scandir(directory) as entries:
+            files = [entry.name for entry in entries
+                     if entry.name.endswith(file_type) and entry.is_file()]
         logger.info(f"Found {len(files)} files with type {file_type} in {directory}")
         return files
         
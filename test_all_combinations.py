@@ -130,22 +130,12 @@ def create_test_character(race_name, subrace_name, class_name, subclass_name, te
 def generate_html_sheet(toon, output_dir):
     """Generate HTML character sheet and save to output directory"""
     try:
-        # Generate HTML
-        html_path = toon.export_character_sheet("html")
+        # Ensure output directory exists
+        os.makedirs(output_dir, exist_ok=True)
         
-        # Move to our output directory
-        if html_path and os.path.exists(html_path):
-            filename = os.path.basename(html_path)
-            new_path = os.path.join(output_dir, filename)
-            
-            # Ensure output directory exists
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Move file
-            os.rename(html_path, new_path)
-            return new_path
-        
-        return None
+        # Generate HTML straight into our output directory; the exporter
+        # raises if the file cannot be written
+        return toon.export_character_sheet("html", output_dir=output_dir) or None
         
     except Exception as e:
         logger.error(f"Error generating HTML for {toon.get_name()}: {e}")
@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 
+import mmap
+from pathlib import Path
 from toon import Toon
 from logging_config import setup_logging
 
-def test_bard():
-    # Initialize logging
-    setup_logging()
-    
+def test_bard(tmp_path):
     # Create a new character
     character = Toon()
     
@@ -32,15 +31,14 @@ def test_bard():
         character.set_subclass("bard", "College of Creation")
     
     # Export to HTML
-    try:
-        html = character.export_character_sheet(format="html")
-        with open("test_bard_output.html", "w") as f:
-            f.write(html)
-        print("Character sheet exported to test_bard_output.html")
-    except Exception as e:
-        print(f"Failed to export: {e}")
-        import traceback
-        traceback.print_exc()
+    sheet_path = character.export_character_sheet(format="html", output_dir=str(tmp_path))
+    with open(sheet_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html:
+        assert html.find(b"<html") != -1
+        assert html.find(b"Test Bard") != -1
 
 if __name__ == "__main__":
-    test_bard() 
\ No newline at end of file
+    # Only configure logging when run as a script; under pytest it would
+    # replace the root handlers for every later test
+    setup_logging()
+    test_bard(Path("characters"))
+    print("Character sheet exported to characters/Test_Bard_sheet.html") 
\ No newline at end of file
@@ -0,0 +1,48 @@
+import json
+import pytest
+import file_functions
+from file_functions import read_data_file, save_file, open_file
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Run a test with orjson when installed and with the stdlib fallback"""
+    if request.param == "orjson":
+        if file_functions.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(file_functions, "orjson", None)
+    return request.param
+
+def test_read_data_file_returns_independent_copies(json_backend, tmp_path):
+    """Test that mutating loaded data does not leak into later loads"""
+    path = tmp_path / "race.json"
+    path.write_text(json.dumps({"name": "Elf", "traits": [{"name": "Darkvision"}]}))
+    
+    first = read_data_file(str(path))
+    first["traits"].append({"name": "Trance"})
+    
+    second = read_data_file(str(path))
+    assert second == {"name": "Elf", "traits": [{"name": "Darkvision"}]}
+
+def test_save_and_open_round_trip(json_backend, tmp_path, monkeypatch):
+    """Test that saved files load back with int keys turned into strings"""
+    monkeypatch.setitem(file_functions.PATHS, "test", str(tmp_path))
+    save_file({"name": "Tester", "features": {3: ["Extra Attack"]}, "notes": "Élan"}, "test", "roundtrip")
+    assert open_file("roundtrip", "test") == {"name": "Tester", "features": {"3": ["Extra Attack"]}, "notes": "Élan"}
+
+def test_read_data_file_reloads_edited_file(tmp_path):
+    """Test that editing a data file invalidates its cached copy"""
+    path = tmp_path / "class.json"
+    path.write_text(json.dumps({"name": "Fighter"}))
+    assert read_data_file(str(path)) == {"name": "Fighter"}
+    
+    path.write_text(json.dumps({"name": "Fighter", "hit_die": 10}))
+    assert read_data_file(str(path)) == {"name": "Fighter", "hit_die": 10}
+
+def test_open_file_parses_large_files(json_backend, tmp_path, monkeypatch):
+    """Test that files above the mmap threshold load the same as small ones"""
+    monkeypatch.setitem(file_functions.PATHS, "test", str(tmp_path))
+    data = {"name": "Archivist", "equipment": [{"item": f"Scroll {i}", "quantity": 1} for i in range(4000)]}
+    (tmp_path / "large.json").write_text(json.dumps(data))
+    assert (tmp_path / "large.json").stat().st_size >= file_functions.MMAP_THRESHOLD
+    assert open_file("large", "test") == data
@@ -1,36 +1,22 @@
-#!/usr/bin/env python3
+from conftest import ABILITIES
 
-from toon import Toon
+def test_initial_state(base_toon_factory):
+    """A new character starts at 10 in every ability with no racial bonuses"""
+    toon = base_toon_factory()
+    assert all(toon.properties['stats'][a] == 10 for a in ABILITIES)
+    assert all(toon.properties['base_stats'][a] == 10 for a in ABILITIES)
+    assert all(toon.properties['racial_bonuses'][a] == 0 for a in ABILITIES)
 
-# Test Standard Human
-print('=== TESTING STANDARD HUMAN DEBUG ===')
-toon1 = Toon()
-toon1.set_name('Standard Human Test')
+def test_standard_human_state(standard_human):
+    """Standard human tracks the +1 bonus separately from base stats"""
+    props = standard_human.properties
+    assert all(props['base_stats'][a] == 10 for a in ABILITIES)
+    assert all(props['racial_bonuses'][a] == 1 for a in ABILITIES)
+    assert all(props['stats'][a] == 11 for a in ABILITIES)
 
-print('Initial state:')
-print('  stats:', {k: v for k, v in toon1.properties['stats'].items()})
-print('  base_stats:', {k: v for k, v in toon1.properties['base_stats'].items()})
-print('  racial_bonuses:', {k: v for k, v in toon1.properties['racial_bonuses'].items()})
-
-toon1.set_race('human', 'Standard')
-print('\nAfter setting Standard Human race:')
-print('  stats:', {k: v for k, v in toon1.properties['stats'].items()})
-print('  base_stats:', {k: v for k, v in toon1.properties['base_stats'].items()})
-print('  racial_bonuses:', {k: v for k, v in toon1.properties['racial_bonuses'].items()})
-
-# Test Variant Human
-print('\n=== TESTING VARIANT HUMAN DEBUG ===')
-toon2 = Toon()
-toon2.set_name('Variant Human Test')
-
-print('Initial state:')
-print('  stats:', {k: v for k, v in toon2.properties['stats'].items()})
-print('  base_stats:', {k: v for k, v in toon2.properties['base_stats'].items()})
-print('  racial_bonuses:', {k: v for k, v in toon2.properties['racial_bonuses'].items()})
-
-toon2.set_race('human', 'Variant')
-print('\nAfter setting Variant Human race:')
-print('  stats:', {k: v for k, v in toon2.properties['stats'].items()})
-print('  base_stats:', {k: v for k, v in toon2.properties['base_stats'].items()})
-print('  racial_bonuses:', {k: v for k, v in toon2.properties['racial_bonuses'].items()})
-print('  pending_choices:', list(toon2.properties.get('pending_choices', {}).keys())) 
\ No newline at end of file
+def test_variant_human_state(variant_human):
+    """Variant human gets no flat bonuses, only pending choices"""
+    props = variant_human.properties
+    assert all(props['stats'][a] == 10 for a in ABILITIES)
+    assert all(props['racial_bonuses'][a] == 0 for a in ABILITIES)
+    assert set(props.get('pending_choices', {})) >= {'languages', 'ability_scores', 'trait_skills', 'trait_feat'}
@@ -1,31 +1,32 @@
-#!/usr/bin/env python3
+import pytest
 
-from toon import Toon
-import json
+@pytest.fixture(scope="module")
+def human_ranger_acolyte(base_toon_factory):
+    """Human ranger with the acolyte background, shared read-only by this module"""
+    toon = base_toon_factory('human', 'Standard', name='Test Human Ranger')
+    toon.add_class('ranger', 1)
+    toon.set_background('acolyte')
+    return toon
 
-# Create a new character
-char = Toon()
-char.set_name('Test Human Ranger')
+def test_human_language_choice(standard_human):
+    """Standard human knows Common and gets one language choice"""
+    assert standard_human.properties['proficiencies']['languages'] == ['Common']
+    assert standard_human.properties['pending_choices']['languages']['count'] == 1
 
-print("=== Testing Language Choice Merging ===")
+def test_ranger_keeps_language_choice(base_toon_factory):
+    """Adding a class leaves the racial language choice untouched"""
+    toon = base_toon_factory('human', 'Standard')
+    toon.add_class('ranger', 1)
+    assert toon.properties['pending_choices']['languages']['count'] == 1
 
-# Set race (should give 1 language choice from human)
-char.set_race('human', 'Standard')
-print("\nAfter setting human race:")
-print("Languages in proficiencies:", char.properties['proficiencies']['languages'])
-print("Pending language choices:", char.properties.get('pending_choices', {}).get('languages', 'None'))
+def test_background_language_choices_merged(human_ranger_acolyte):
+    """Acolyte language choices are added to the racial one instead of replacing it"""
+    pending = human_ranger_acolyte.properties['pending_choices']
+    assert human_ranger_acolyte.properties['proficiencies']['languages'] == ['Common']
+    assert pending['languages']['count'] == 3
 
-# Add class
-char.add_class('ranger', 1)
-print("\nAfter adding ranger class:")
-print("Pending language choices:", char.properties.get('pending_choices', {}).get('languages', 'None'))
-
-# Set background (acolyte gives 2 more language choices)
-char.set_background('acolyte')
-print("\nAfter setting acolyte background:")
-print("Languages in proficiencies:", char.properties['proficiencies']['languages'])
-print("Pending language choices:", char.properties.get('pending_choices', {}).get('languages', 'None'))
-
-# Print all pending choices
-print("\nAll pending choices:")
-print(json.dumps(char.properties.get('pending_choices', {}), indent=2)) 
\ No newline at end of file
+def test_background_keeps_other_choices(human_ranger_acolyte):
+    """Class skill and background personality choices remain pending"""
+    pending = human_ranger_acolyte.properties['pending_choices']
+    assert pending['class_ranger_skills']['count'] == 3
+    assert 'personality' in pending
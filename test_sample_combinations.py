@@ -5,8 +5,61 @@ Useful for rapid testing without generating hundreds of character sheets.
 """
 
 from toon import Toon
+from multiprocessing import Pool
+from functools import partial
 import os
 
+def _build_one(combination, output_dir):
+    """Build one sample character and export its HTML sheet into output_dir
+    
+    Runs in a worker process. Returns (char_name, html_path, error).
+    """
+    race, subrace, class_name, subclass, level = combination
+    
+    # Create character name
+    char_name = f"{race}"
+    if subrace:
+        char_name += f" {subrace}"
+    char_name += f" {class_name}"
+    if subclass:
+        char_name += f" ({subclass})"
+    
+    try:
+        # Create character
+        toon = Toon()
+        toon.set_name(char_name)
+        
+        # Set race
+        if subrace:
+            toon.set_race(race.lower(), subrace)
+        else:
+            toon.set_race(race.lower())
+        
+        # Set ability scores
+        toon.set_ability_scores({
+            "strength": 15,
+            "dexterity": 14,
+            "constitution": 13,
+            "intelligence": 12,
+            "wisdom": 10,
+            "charisma": 8
+        })
+        
+        # Add class
+        toon.add_class(class_name.lower(), level)
+        
+        # Set subclass if available
+        if subclass and level >= 3:
+            toon.set_subclass(class_name.lower(), subclass)
+        
+        # Set background
+        toon.set_background("acolyte")
+        
+        # Generate HTML
+        return char_name, toon.export_character_sheet("html", output_dir=output_dir), None
+    except Exception as e:
+        return char_name, None, str(e)
+
 def create_sample_characters():
     """Create a sample of interesting character combinations"""
     
@@ -32,72 +85,34 @@ def create_sample_characters():
     
     successful = 0
     failed = 0
+    lines = []
     
-    for i, (race, subrace, class_name, subclass, level) in enumerate(combinations, 1):
-        try:
-            # Create character name
-            char_name = f"{race}"
-            if subrace:
-                char_name += f" {subrace}"
-            char_name += f" {class_name}"
-            if subclass:
-                char_name += f" ({subclass})"
-            
-            print(f"[{i}/{len(combinations)}] Creating {char_name}...", end=" ")
-            
-            # Create character
-            toon = Toon()
-            toon.set_name(char_name)
-            
-            # Set race
-            if subrace:
-                toon.set_race(race.lower(), subrace)
-            else:
-                toon.set_race(race.lower())
-            
-            # Set ability scores
-            toon.set_ability_scores({
-                "strength": 15,
-                "dexterity": 14,
-                "constitution": 13,
-                "intelligence": 12,
-                "wisdom": 10,
-                "charisma": 8
-            })
-            
-            # Add class
-            toon.add_class(class_name.lower(), level)
-            
-            # Set subclass if available
-            if subclass and level >= 3:
-                toon.set_subclass(class_name.lower(), subclass)
-            
-            # Set background
-            toon.set_background("acolyte")
-            
-            # Generate HTML
-            html_path = toon.export_character_sheet("html")
-            
-            if html_path and os.path.exists(html_path):
-                # Move to output directory
-                filename = os.path.basename(html_path)
-                new_path = os.path.join(output_dir, filename)
-                os.rename(html_path, new_path)
-                print("✅")
+    # Characters are independent, so build them in parallel worker processes
+    with Pool(min(os.cpu_count() or 1, len(combinations))) as pool:
+        results = pool.imap_unordered(partial(_build_one, output_dir=output_dir), combinations)
+        for i, (char_name, html_path, error) in enumerate(results, 1):
+            prefix = f"[{i}/{len(combinations)}] {char_name}..."
+            if error:
+                lines.append(f"{prefix} ❌ Error: {error}")
+                failed += 1
+            elif html_path:
+                lines.append(f"{prefix} ✅")
                 successful += 1
             else:
-                print("❌ Failed to generate HTML")
+                lines.append(f"{prefix} ❌ Failed to generate HTML")
                 failed += 1
-                
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            failed += 1
     
-    print(f"\n📊 Sample Generation Complete!")
-    print(f"✅ Successful: {successful}")
-    print(f"❌ Failed: {failed}")
-    print(f"📁 Output directory: {output_dir}")
-    print(f"\n💡 Open any HTML file in a web browser to test the mechanics toggle!")
+    # Write the report in one go instead of a few small writes per character
+    lines += [
+        "",
+        "📊 Sample Generation Complete!",
+        f"✅ Successful: {successful}",
+        f"❌ Failed: {failed}",
+        f"📁 Output directory: {output_dir}",
+        "",
+        "💡 Open any HTML file in a web browser to test the mechanics toggle!",
+    ]
+    print("\n".join(lines))
 
 if __name__ == "__main__":
     create_sample_characters() 
\ No newline at end of file
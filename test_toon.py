@@ -0,0 +1,378 @@
+import json
+import os
+import random
+import pytest
+from file_functions import PATHS
+import toon as toon_module
+from toon import DiceRoll, Toon
+
+def test_basic_roll():
+    """Test rolling dice stays within the possible range"""
+    for _ in range(50):
+        assert 2 <= DiceRoll.roll("2d6") <= 12
+
+def test_roll_with_modifier():
+    """Test positive and negative modifiers"""
+    for _ in range(50):
+        assert 4 <= DiceRoll.roll("1d4+3") <= 7
+        assert -1 <= DiceRoll.roll("1d4 - 2") <= 2
+
+def test_flat_value():
+    """Test notation without dice"""
+    assert DiceRoll.roll("5") == 5
+    assert DiceRoll.roll("5+2") == 7
+
+@pytest.mark.parametrize("notation", ["d", "1d", "d20", "2d6+", "abc", "", "1d0", "2d6d6", "1d4+-2"])
+def test_invalid_dice(notation):
+    """Test invalid dice notation raises ValueError"""
+    with pytest.raises(ValueError):
+        DiceRoll.roll(notation)
+
+def test_export_html_to_output_dir(base_toon_factory, tmp_path):
+    """Test that file exports honour output_dir"""
+    toon = base_toon_factory('human', 'Standard', name='Sheet Test')
+    toon.add_class('fighter', 1)
+    path = toon.export_character_sheet("html", output_dir=str(tmp_path))
+    assert path == str(tmp_path / "Sheet_Test_sheet.html")
+    assert "Sheet Test" in (tmp_path / "Sheet_Test_sheet.html").read_text(encoding='utf-8')
+
+def test_export_json_round_trips(base_toon_factory):
+    """Test that the JSON export is valid JSON matching the character"""
+    toon = base_toon_factory('human', 'Standard', name='Json Test')
+    toon.add_class('fighter', 3)
+    data = json.loads(toon.export_character_sheet("json"))
+    assert data["name"] == "Json Test"
+    assert data == json.loads(json.dumps(toon.properties))
+
+def test_list_saved_characters_tracks_save_and_delete(base_toon_factory, tmp_path, monkeypatch):
+    """Test that the cached character listing is refreshed on save and delete"""
+    monkeypatch.setitem(PATHS, "characters", str(tmp_path))
+    assert Toon.list_saved_characters() == []
+    
+    toon = base_toon_factory('human', 'Standard', name='Listed Hero')
+    filename = toon.save()
+    listing = Toon.list_saved_characters()
+    assert [c["name"] for c in listing] == ['Listed Hero']
+    assert Toon.list_saved_characters() == listing
+    
+    toon.delete_save(filename)
+    assert Toon.list_saved_characters() == []
+
+def test_list_saved_characters_returns_copies(base_toon_factory, tmp_path, monkeypatch):
+    """Test that mutating a returned listing does not leak into later listings"""
+    monkeypatch.setitem(PATHS, "characters", str(tmp_path))
+    monkeypatch.setattr(Toon, '_summary_cache', {})
+    monkeypatch.setattr(Toon, '_listing_cache', None)
+    toon = base_toon_factory('human', 'Standard', name='Stable Hero')
+    toon.add_class('fighter', 1)
+    toon.save()
+    
+    listing = Toon.list_saved_characters()
+    listing[0]["name"] = "Tampered"
+    listing[0]["classes"].append("Wizard 9")
+    listing.clear()
+    fresh = Toon.list_saved_characters()
+    assert fresh[0]["name"] == "Stable Hero"
+    assert fresh[0]["classes"] == ["Fighter 1"]
+
+def test_list_saved_characters_reparses_only_changed_files(base_toon_factory, tmp_path, monkeypatch):
+    """Test that unchanged save files are summarized from the cache"""
+    monkeypatch.setitem(PATHS, "characters", str(tmp_path))
+    first = base_toon_factory('human', 'Standard', name='First')
+    second = base_toon_factory('human', 'Standard', name='Second')
+    first.save('first')
+    second.save('second')
+    Toon.list_saved_characters()
+    
+    opened = []
+    real_open_file = toon_module.open_file
+    monkeypatch.setattr(toon_module, 'open_file', lambda name, key: opened.append(name) or real_open_file(name, key))
+    second.set_name('Second Renamed')
+    second.save('second')
+    names = {c["name"] for c in Toon.list_saved_characters()}
+    assert names == {'First', 'Second Renamed'}
+    assert opened == ['second']
+
+def test_list_saved_characters_reuses_persisted_index(base_toon_factory, tmp_path, monkeypatch):
+    """Test that a fresh process lists unchanged saves from the sidecar index"""
+    monkeypatch.setitem(PATHS, "characters", str(tmp_path))
+    base_toon_factory('human', 'Standard', name='Indexed').save('indexed')
+    listing = Toon.list_saved_characters()
+    assert (tmp_path / Toon._SUMMARY_INDEX).is_file()
+    
+    # Simulate a new process: nothing cached in memory
+    monkeypatch.setattr(Toon, '_summary_cache', {})
+    monkeypatch.setattr(Toon, '_listing_cache', None)
+    monkeypatch.setattr(toon_module, 'open_file', lambda name, key: pytest.fail(f"re-parsed {name}"))
+    assert Toon.list_saved_characters() == listing
+
+@pytest.mark.parametrize("index", [b"[1, 2]", b'{"a.json": [[1, 2], "oops"]}', b'{"a.json": 5}', b"not json"])
+def test_list_saved_characters_ignores_malformed_index(base_toon_factory, tmp_path, monkeypatch, index):
+    """Test that a corrupt sidecar index falls back to parsing the save files"""
+    monkeypatch.setitem(PATHS, "characters", str(tmp_path))
+    monkeypatch.setattr(Toon, '_summary_cache', {})
+    monkeypatch.setattr(Toon, '_listing_cache', None)
+    base_toon_factory('human', 'Standard', name='Survivor').save('survivor')
+    (tmp_path / Toon._SUMMARY_INDEX).write_bytes(index)
+    assert [c["name"] for c in Toon.list_saved_characters()] == ['Survivor']
+
+def test_list_saved_characters_cache_survives_index_write(base_toon_factory, tmp_path, monkeypatch):
+    """Test that writing the sidecar index does not invalidate the listing cache"""
+    monkeypatch.setitem(PATHS, "characters", str(tmp_path))
+    monkeypatch.setattr(Toon, '_summary_cache', {})
+    monkeypatch.setattr(Toon, '_listing_cache', None)
+    base_toon_factory('human', 'Standard', name='Cached').save('cached')
+    listing = Toon.list_saved_characters()
+    assert (tmp_path / Toon._SUMMARY_INDEX).is_file()
+    
+    monkeypatch.setattr(toon_module, 'list_files', lambda *args: pytest.fail("rescanned the directory"))
+    assert Toon.list_saved_characters() == listing
+
+def test_has_unsaved_changes(base_toon_factory, tmp_path, monkeypatch):
+    """Test change tracking across save, load and edits"""
+    monkeypatch.setitem(PATHS, "characters", str(tmp_path))
+    toon = base_toon_factory('human', 'Standard', name='Tracked')
+    assert toon.has_unsaved_changes()
+    
+    filename = toon.save()
+    assert not toon.has_unsaved_changes()
+    
+    loaded = Toon(load_from=filename)
+    assert not loaded.has_unsaved_changes()
+    loaded.add_class('fighter', 1)
+    assert loaded.has_unsaved_changes()
+
+def test_roll_covers_every_face():
+    """Test that bulk rolls produce every face and nothing else"""
+    random.seed(1234)
+    faces = {DiceRoll.roll("1d6") for _ in range(200)}
+    assert faces == {1, 2, 3, 4, 5, 6}
+    assert 20 <= DiceRoll.roll("20d6") <= 120
+
+def test_apply_trait_modifies_paths(base_toon_factory):
+    """Test nested, new and scalar-replacing trait modification paths"""
+    toon = base_toon_factory()
+    toon.properties["speed"] = 30
+    toon._apply_trait_modifies({"modifies": {
+        "speed.walk": 35,
+        "senses.darkvision.range": 60,
+    }})
+    assert toon.properties["speed"] == 35
+    assert toon.properties["senses"] == {"darkvision": {"range": 60}}
+
+def test_apply_trait_grants_keeps_proficiency_order(base_toon_factory):
+    """Test that granted proficiencies are deduplicated in first-seen order"""
+    toon = base_toon_factory()
+    toon.properties["proficiencies"]["weapons"] = ["Longsword", "Dagger"]
+    toon._apply_trait_grants({"weapon_proficiencies": ["Shortbow", "Dagger", "Longbow"]})
+    assert toon.properties["proficiencies"]["weapons"] == ["Longsword", "Dagger", "Shortbow", "Longbow"]
+
+def test_format_hit_dice_for_pdf(base_toon_factory):
+    """Test hit dice are grouped by die size, smallest first"""
+    toon = base_toon_factory()
+    toon.properties["hit_dice"] = ["1d10", "1d6", "1d10", "1d6", "1d6"]
+    assert toon._format_hit_dice_for_pdf() == ("3/2", "1d6, 1d10")
+    toon.properties["hit_dice"] = ["1d8", "1d8"]
+    assert toon._format_hit_dice_for_pdf() == ("2", "1d8")
+
+@pytest.mark.parametrize("level, expected", [(1, 3), (3, 3), (4, 4), (10, 5), (20, 5)])
+def test_cantrips_known_uses_highest_applicable_level(base_toon_factory, level, expected):
+    """Test cantrips known picks the progression entry for the highest level reached"""
+    toon = base_toon_factory()
+    toon.add_class("wizard", level)
+    assert toon._get_cantrips_known_for_level() == {level: expected}
+
+def test_html_export_loads_each_class_once(base_toon_factory, tmp_path, monkeypatch):
+    """Test the HTML export reads each class's data once for all spellcasting details"""
+    toon = base_toon_factory()
+    toon.add_class("wizard", 3)
+    toon.add_class("cleric", 2)
+    loads = []
+    real_load = Toon._load_data_file
+    monkeypatch.setattr(Toon, "_load_data_file", lambda self, category, name: loads.append(name) or real_load(self, category, name))
+    
+    toon.export_character_sheet("html", output_dir=str(tmp_path))
+    assert sorted(loads) == ["Cleric", "Wizard"]
+
+@pytest.mark.parametrize("scores, message", [
+    ({"strength": 7}, "between 8 and 20"),
+    ({"strength": 21}, "between 8 and 20"),
+    ({"luck": 12}, "Invalid ability score name"),
+])
+def test_set_ability_scores_rejects_invalid(base_toon_factory, scores, message):
+    """Test invalid ability scores raise without touching the base scores"""
+    toon = base_toon_factory()
+    before = dict(toon.properties["base_stats"])
+    with pytest.raises(ValueError, match=message):
+        toon.set_ability_scores({"dexterity": 14, **scores})
+    assert toon.properties["base_stats"] == before
+
+def test_set_ability_scores_accepts_mixed_case(base_toon_factory):
+    """Test ability names are matched case-insensitively"""
+    toon = base_toon_factory()
+    toon.set_ability_scores({"Strength": 16, "WISDOM": 9})
+    assert toon.properties["base_stats"]["strength"] == 16
+    assert toon.properties["base_stats"]["wisdom"] == 9
+
+def test_set_race_rejects_unknown_subrace():
+    """Test an unknown subrace is rejected before the race is applied"""
+    toon = Toon()
+    with pytest.raises(ValueError, match="Invalid subrace"):
+        toon.set_race("elf", "Moon Elf")
+    assert toon.properties["race"] == ""
+
+def test_toon_has_no_instance_dict(base_toon_factory):
+    """Test Toon instances only carry their declared slots"""
+    toon = base_toon_factory()
+    assert not hasattr(toon, "__dict__")
+    with pytest.raises(AttributeError):
+        toon.nickname = "Stray attribute"
+
+def test_pdf_field_names_are_read_once(base_toon_factory):
+    """Test the PDF template's form fields are parsed once and returned as copies"""
+    pytest.importorskip("PyPDF2")
+    template = "templates/5E_CharacterSheet_Fillable.pdf"
+    toon = base_toon_factory()
+    toon_module._read_pdf_form_fields.cache_clear()
+    fields = toon._get_pdf_field_names(template)
+    assert "CharacterName" in fields
+    
+    fields.clear()
+    assert "CharacterName" in toon._get_pdf_field_names(template)
+    assert toon_module._read_pdf_form_fields.cache_info().misses == 1
+
+def test_export_pdf_without_pdftk(base_toon_factory, tmp_path, monkeypatch):
+    """Test the in-process PDF form fill used when pdftk is not installed"""
+    PdfReader = pytest.importorskip("PyPDF2").PdfReader
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    toon = base_toon_factory(name="Form Filler")
+    toon.properties["skills"]["acrobatics"] = True
+    
+    path = toon.export_character_sheet("pdf", output_dir=str(tmp_path))
+    fields = PdfReader(path).get_fields()
+    assert fields["CharacterName"]["/V"] == "Form Filler"
+    assert fields["Check Box 23"]["/V"] == "/Yes"
+    assert fields["Check Box 24"]["/V"] == "/Off"
+    assert "\n" in fields["ProficienciesLang"]["/V"]
+
+def test_export_pdf_skips_fields_missing_from_template(base_toon_factory, tmp_path, monkeypatch):
+    """Test field names the template lacks are dropped before the form is filled"""
+    pytest.importorskip("PyPDF2")
+    filled = {}
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    monkeypatch.setattr(toon_module, "_fill_pdf_form", lambda template, values, out: filled.update(values) or open(out, 'wb').close())
+    monkeypatch.setattr(toon_module, "_PDF_ABILITY_FIELDS", (("strength", "STR", "No Such Field", "ST Strength", "Check Box 11"),))
+    
+    base_toon_factory().export_character_sheet("pdf", output_dir=str(tmp_path))
+    assert "No Such Field" not in filled
+    assert "STR" in filled and "CharacterName" in filled
+
+def test_pdf_field_table_check_warns_about_missing_fields(monkeypatch):
+    """Test the import-time table check reports names the template lacks"""
+    pytest.importorskip("PyPDF2")
+    warnings = []
+    monkeypatch.setattr(toon_module.logger, "warning", warnings.append)
+    toon_module._check_pdf_field_tables(toon_module._PDF_TEMPLATE_PATH)
+    assert warnings == []
+    
+    monkeypatch.setattr(toon_module, "_PDF_SPELLCASTING_FIELDS", (("Spellcasting Class 1",),))
+    toon_module._check_pdf_field_tables(toon_module._PDF_TEMPLATE_PATH)
+    assert len(warnings) == 1 and "Spellcasting Class 1" in warnings[0]
+
+def test_export_pdf_with_pdftk_survives_unreadable_template_fields(base_toon_factory, tmp_path, monkeypatch):
+    """Test a PyPDF2 failure reading the template does not stop a pdftk export"""
+    def unreadable(*args):
+        raise ValueError("PdfReadError: could not read xref table")
+    def fake_run(args, **kwargs):
+        with open(args[5], 'wb') as f:
+            f.write(b"%PDF-1.4\n")
+    monkeypatch.setattr(toon_module, "_read_pdf_form_fields", unreadable)
+    monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/pdftk")
+    monkeypatch.setattr("subprocess.run", fake_run)
+    
+    path = base_toon_factory(name="Resilient").export_character_sheet("pdf", output_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+def test_export_pdf_pipes_fdf_to_pdftk(base_toon_factory, tmp_path, monkeypatch):
+    """Test the FDF form data is sent to pdftk on stdin rather than a temp file"""
+    calls = []
+    monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/pdftk")
+    def fake_run(args, **kwargs):
+        calls.append((args, kwargs))
+        with open(args[5], 'wb') as f:
+            f.write(b"%PDF-1.4\n")
+    monkeypatch.setattr("subprocess.run", fake_run)
+    toon = base_toon_factory(name="Piped (Hero)")
+    
+    path = toon.export_character_sheet("pdf", output_dir=str(tmp_path))
+    (args, kwargs), = calls
+    assert args[:4] == ["pdftk", "templates/5E_CharacterSheet_Fillable.pdf", "fill_form", "-"]
+    assert args[4] == "output" and args[6] == "flatten"
+    assert os.path.dirname(args[5]) == str(tmp_path) and args[5].endswith(".pdf.tmp")
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    assert kwargs["input"].startswith(b"%FDF-1.2\n")
+    assert b"/T (CharacterName)\n/V (Piped \\(Hero\\))\n" in kwargs["input"]
+
+def test_export_pdf_failure_leaves_no_temp_file(base_toon_factory, tmp_path, monkeypatch):
+    """Test a failed fill cleans up its temporary file and raises CharacterError"""
+    def failing_fill(template, values, out):
+        with open(out, 'wb') as f:
+            f.write(b"%PDF-1.4 partial")
+        raise OSError("disk full")
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    monkeypatch.setattr(toon_module, "_fill_pdf_form", failing_fill)
+    
+    with pytest.raises(toon_module.CharacterError, match="disk full"):
+        base_toon_factory().export_character_sheet("pdf", output_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+@pytest.mark.parametrize("value, expected", [
+    ("Plain", "(Plain)"),
+    ("a (b) \\ c", "(a \\(b\\) \\\\ c)"),
+    ("one\ntwo", "(one\\rtwo)"),
+    ("Élan", "<FEFF00C9006C0061006E>"),
+])
+def test_fdf_value_encoding(value, expected):
+    """Test FDF values are escaped, or hex-encoded when not ASCII"""
+    assert toon_module._fdf_value(value) == expected
+
+def test_pdf_field_tables_match_template(base_toon_factory):
+    """Test every table-driven field the PDF export fills is present in the template"""
+    pytest.importorskip("PyPDF2")
+    fields = base_toon_factory()._get_pdf_field_names("templates/5E_CharacterSheet_Fillable.pdf")
+    for skill, bonus_field, checkbox_field in toon_module._PDF_SKILL_FIELDS:
+        assert skill in toon_module._SKILL_ABILITIES
+        assert bonus_field in fields and checkbox_field in fields
+    for ability, *ability_fields in toon_module._PDF_ABILITY_FIELDS:
+        assert ability in toon_module._VALID_ABILITIES
+        assert all(name in fields for name in ability_fields)
+    for spell_fields in toon_module._PDF_SPELLCASTING_FIELDS:
+        assert all(name in fields for name in spell_fields)
+
+def test_export_many_keeps_input_order(base_toon_factory, tmp_path):
+    """Test batch export writes every sheet and returns paths in input order"""
+    names = ["Alpha", "Bravo", "Charlie"]
+    toons = [base_toon_factory(name=name) for name in names]
+    paths = Toon.export_many(toons, "html", output_dir=str(tmp_path), max_workers=2)
+    assert [os.path.basename(p) for p in paths] == [f"{name}_sheet.html" for name in names]
+    assert all(os.path.getsize(p) > 0 for p in paths)
+    assert Toon.export_many([], "html") == []
+
+@pytest.mark.parametrize("value, expected", [(0, "+0"), (3, "+3"), (-1, "-1"), (45, "+45"), (-33, "-33")])
+def test_signed_bonus_formatting(value, expected):
+    """Test bonuses are rendered with an explicit sign, including outside the lookup range"""
+    assert toon_module._signed(value) == expected
+
+def test_export_many_rejects_duplicate_targets(base_toon_factory, tmp_path, monkeypatch):
+    """Test batch export refuses characters that would write the same sheet file"""
+    twin = base_toon_factory(name="Twin")
+    other = base_toon_factory(name="Twin")
+    # String formats write no files, so repeats are fine
+    assert len(Toon.export_many([twin, twin], "text", max_workers=2)) == 2
+    
+    exported = []
+    monkeypatch.setattr(Toon, "export_character_sheet", lambda self, format, output_dir=None: exported.append(self))
+    for batch in ([twin, other], [twin, twin, base_toon_factory(name="Solo")]):
+        with pytest.raises(toon_module.CharacterError, match="Twin_sheet.pdf"):
+            Toon.export_many(batch, "pdf", output_dir=str(tmp_path), max_workers=3)
+    assert exported == [] and os.listdir(tmp_path) == []
@@ -1,51 +1,301 @@
 from logging_config import get_logger
+import functools
 import json
 import os
+import shutil
+import subprocess
+import tempfile
 from typing import Dict, List, Optional, Union
 import random
-from file_functions import save_file, open_file, list_files, remove_file
+from file_functions import save_file, open_file, list_files, remove_file, read_data_file, PATHS
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from background import Background
 
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used when missing
+    orjson = None
+
 logger = get_logger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _get_html_template(name: str):
+    """Load and compile a Jinja2 template once per process"""
+    env = Environment(
+        loader=FileSystemLoader('templates'),
+        autoescape=True
+    )
+    return env.get_template(name)
+
+@functools.lru_cache(maxsize=4)
+def _read_pdf_form_fields(pdf_path: str, mtime_ns: int) -> Dict:
+    """Read a fillable PDF's form field names and types once per file version"""
+    from PyPDF2 import PdfReader
+    reader = PdfReader(pdf_path, strict=False)
+    fields = {}
+    
+    if '/AcroForm' in reader.trailer['/Root']:
+        form = reader.trailer['/Root']['/AcroForm'].get_object()
+        field_objects = form.get('/Fields')
+        # The field array may itself be an indirect reference
+        for field in (field_objects.get_object() if field_objects is not None else []):
+            field_obj = field.get_object()
+            field_name = field_obj.get('/T')
+            field_type = field_obj.get('/FT')
+            fields[field_name] = field_type
+            logger.debug(f"Found field: {field_name} of type {field_type}")
+    
+    return fields
+
+def _fill_pdf_form(template_path: str, values: Dict[str, str], output_path: str) -> None:
+    """Fill a PDF form in-process with PyPDF2, for systems without pdftk
+    
+    Unlike the pdftk export the result is not flattened: fields stay editable
+    and viewers are asked to regenerate their appearance.
+    """
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import ArrayObject, BooleanObject, DictionaryObject, NameObject
+    
+    field_types = _read_pdf_form_fields(template_path, os.stat(template_path).st_mtime_ns)
+    reader = PdfReader(template_path, strict=False)
+    writer = PdfWriter()
+    writer.append_pages_from_reader(reader)
+    
+    # PyPDF2 copies the widgets but not the AcroForm, so rebuild it around them
+    fields = ArrayObject()
+    for page in writer.pages:
+        annots = page.get('/Annots')
+        for annot in (annots.get_object() if annots is not None else []):
+            if annot.get_object().get('/T') is not None:
+                fields.append(annot)
+    acro_form = DictionaryObject({
+        NameObject('/Fields'): fields,
+        NameObject('/NeedAppearances'): BooleanObject(True)
+    })
+    source_form = reader.trailer['/Root']['/AcroForm'].get_object()
+    for key in ('/DA', '/DR'):
+        if key in source_form:
+            acro_form[NameObject(key)] = source_form[key]
+    writer._root_object[NameObject('/AcroForm')] = acro_form
+    
+    # Checkbox states are PDF names; text values get real newlines
+    form_values = {
+        name: f"/{value}" if field_types.get(name) == '/Btn' else str(value).replace('\\n', '\n')
+        for name, value in values.items()
+    }
+    for page in writer.pages:
+        writer.update_page_form_field_values(page, form_values)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+
+# Signed renderings of every bonus a sheet can realistically show
+_SIGNED = {value: f"{value:+d}" for value in range(-20, 31)}
+
+def _signed(value: int) -> str:
+    """Format a bonus with an explicit sign, e.g. +3 or -1"""
+    return _SIGNED.get(value) or f"{value:+d}"
+
+# Static FDF document framing around the /Fields array
+_FDF_HEADER = b"%FDF-1.2\n1 0 obj\n<<\n/FDF\n<<\n/Fields [\n"
+_FDF_TRAILER = b"]\n>>\n>>\nendobj\ntrailer\n<<\n/Root 1 0 R\n>>\n%%EOF\n"
+
+# FDF literal string escapes; newlines become \r, which form fields treat as line breaks
+_FDF_ESCAPE = str.maketrans({'\\': '\\\\', '(': '\\(', ')': '\\)', '\n': '\\r'})
+
+def _fdf_value(value: str) -> str:
+    """Encode a form value as an FDF string object
+    
+    ASCII values are written as escaped literal strings; anything else as
+    UTF-16BE hex so non-ASCII names survive pdftk's PDFDocEncoding.
+    """
+    if value.isascii():
+        return f"({value.translate(_FDF_ESCAPE)})"
+    encoded = value.replace('\n', '\r').encode('utf-16-be')
+    return f"<FEFF{encoded.hex().upper()}>"
+
+# Keyword tables for sorting features into the combat and non-combat sheet sections
+_COMBAT_ACTION_TYPES = frozenset(('action', 'reaction', 'bonus_action'))
+_COMBAT_KEYWORDS = (
+    "attack roll", "damage", "hit points", "AC", "armor class",
+    "initiative", "reaction", "bonus action", "weapon",
+    "resistance", "immunity", "spell attack", "combat",
+    "defense", "shield", "dodge", "critical", "temporary hp",
+    "martial", "maneuver", "rage", "smite", "sneak attack",
+    "fighting style", "proficiency with", "disadvantage on attack",
+    "advantage on attack"
+)
+_NON_COMBAT_KEYWORDS = (
+    "skill", "social", "interact", "craft", "create",
+    "explore", "investigate", "survival", "culture",
+    "background", "knowledge", "profession", "lifestyle",
+    "residence", "ceremony", "meditation", "study",
+    "tracking", "recall information", "familiar with",
+    "environment", "healing", "care", "temple", "shrine"
+)
+# Feature names containing these are always combat / always non-combat
+_COMBAT_NAMES = (
+    "fighting style", "martial", "weapon training", "armor training",
+    "divine smite", "sneak attack", "rage", "martial arts",
+    "extra attack", "unarmored defense", "defensive tactics"
+)
+_NON_COMBAT_NAMES = (
+    "darkvision", "superior darkvision", "keen senses", "trance",
+    "shelter of the faithful", "natural explorer", "favored enemy",
+    "languages", "tool proficiency", "skill proficiency"
+)
+_COMBAT_SPELL_INDICATORS = ("damage", "attack", "hit", "defense", "weapon")
+_UTILITY_SPELL_INDICATORS = ("utility", "light", "illusion", "communication", "travel")
+
+# D&D 5E skill to ability score mapping
+_SKILL_ABILITIES = {
+    'acrobatics': 'dexterity',
+    'animal handling': 'wisdom',
+    'arcana': 'intelligence',
+    'athletics': 'strength',
+    'deception': 'charisma',
+    'history': 'intelligence',
+    'insight': 'wisdom',
+    'intimidation': 'charisma',
+    'investigation': 'intelligence',
+    'medicine': 'wisdom',
+    'nature': 'intelligence',
+    'perception': 'wisdom',
+    'performance': 'charisma',
+    'persuasion': 'charisma',
+    'religion': 'intelligence',
+    'sleight of hand': 'dexterity',
+    'stealth': 'dexterity',
+    'survival': 'wisdom'
+}
+
+# Headings and proficiency keys for the sheet's proficiencies & languages box
+_PDF_PROFICIENCY_SECTIONS = (
+    ('LANGUAGES', 'languages'),
+    ('ARMOR PROFICIENCIES', 'armor'),
+    ('WEAPON PROFICIENCIES', 'weapons'),
+    ('TOOL PROFICIENCIES', 'tools')
+)
+
+# Ability -> (score, modifier, saving throw, save proficiency checkbox) fields
+# on the fillable PDF sheet; two modifier names are spelled oddly in the template
+_PDF_ABILITY_FIELDS = (
+    ('strength', 'STR', 'STRmod', 'ST Strength', 'Check Box 11'),
+    ('dexterity', 'DEX', 'DEXmod ', 'ST Dexterity', 'Check Box 18'),
+    ('constitution', 'CON', 'CONmod', 'ST Constitution', 'Check Box 19'),
+    ('intelligence', 'INT', 'INTmod', 'ST Intelligence', 'Check Box 20'),
+    ('wisdom', 'WIS', 'WISmod', 'ST Wisdom', 'Check Box 21'),
+    ('charisma', 'CHA', 'CHamod', 'ST Charisma', 'Check Box 22')
+)
+
+# Skill -> (bonus field, proficiency checkbox) on the fillable PDF sheet;
+# several field names carry a trailing space in the template
+_PDF_SKILL_FIELDS = (
+    ('acrobatics', 'Acrobatics', 'Check Box 23'),
+    ('animal handling', 'Animal', 'Check Box 24'),
+    ('arcana', 'Arcana', 'Check Box 25'),
+    ('athletics', 'Athletics', 'Check Box 26'),
+    ('deception', 'Deception ', 'Check Box 27'),
+    ('history', 'History ', 'Check Box 28'),
+    ('insight', 'Insight', 'Check Box 29'),
+    ('intimidation', 'Intimidation', 'Check Box 30'),
+    ('investigation', 'Investigation ', 'Check Box 31'),
+    ('medicine', 'Medicine', 'Check Box 32'),
+    ('nature', 'Nature', 'Check Box 33'),
+    ('perception', 'Perception ', 'Check Box 34'),
+    ('performance', 'Performance', 'Check Box 35'),
+    ('persuasion', 'Persuasion', 'Check Box 36'),
+    ('religion', 'Religion', 'Check Box 37'),
+    ('sleight of hand', 'SleightofHand', 'Check Box 38'),
+    ('stealth', 'Stealth ', 'Check Box 39'),
+    ('survival', 'Survival', 'Check Box 40')
+)
+
+# (class, ability, save DC, attack bonus) fields for each spellcasting block on
+# the fillable PDF sheet. The template has a single block, on the spells page,
+# whose fields all end in " 2" (the save DC one with two spaces before it)
+_PDF_SPELLCASTING_FIELDS = (
+    ('Spellcasting Class 2', 'SpellcastingAbility 2', 'SpellSaveDC  2', 'SpellAtkBonus 2'),
+)
+
+_PDF_TEMPLATE_PATH = os.path.join('templates', '5E_CharacterSheet_Fillable.pdf')
+
+def _template_field_names(template_path: str) -> Optional[Dict]:
+    """Get a fillable PDF's cached form fields, or None if PyPDF2 can't read them"""
+    try:
+        return _read_pdf_form_fields(template_path, os.stat(template_path).st_mtime_ns)
+    except Exception as e:  # PyPDF2 is optional when pdftk is installed
+        logger.debug(f"Could not read form fields from {template_path}: {e}")
+        return None
+
+def _check_pdf_field_tables(template_path: str) -> None:
+    """Warn if the sheet field tables name fields the template does not have"""
+    fields = _template_field_names(template_path)
+    if not fields:
+        return
+    expected = {name for _, *names in _PDF_SKILL_FIELDS + _PDF_ABILITY_FIELDS for name in names}
+    expected.update(name for names in _PDF_SPELLCASTING_FIELDS for name in names)
+    missing = expected - fields.keys()
+    if missing:
+        logger.warning(f"PDF template {template_path} has no fields {sorted(missing)}; they will be left blank")
+
+# Checked once at import; the field read is cached for later exports
+_check_pdf_field_tables(_PDF_TEMPLATE_PATH)
+
+_VALID_ABILITIES = frozenset(
+    ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")
+)
+
+@functools.lru_cache(maxsize=None)
+def _split_path(path: str) -> tuple:
+    """Split a dotted property path once per distinct path"""
+    return tuple(path.split('.'))
+
 class CharacterError(Exception):
     """Custom exception for character-related errors"""
     pass
 
 class DiceRoll:
+    __slots__ = ()
+
     @staticmethod
     def roll(dice_str: str) -> int:
         """Roll dice based on standard D&D notation (e.g., '2d6+3')"""
         try:
-            # Remove spaces
-            dice_str = dice_str.replace(' ', '')
-            
-            # Handle modifiers
-            if '+' in dice_str:
-                dice_part, mod_part = dice_str.split('+')
-                modifier = int(mod_part)
-            elif '-' in dice_str:
-                dice_part, mod_part = dice_str.split('-')
-                modifier = -int(mod_part)
-            else:
-                dice_part = dice_str
-                modifier = 0
+            # Split 'NdM+K' into its parts: count, optional sides, optional modifier
+            dice_part, sign, mod_part = dice_str.replace(' ', '').partition('+')
+            if not sign:
+                dice_part, sign, mod_part = dice_part.partition('-')
+            count, d, sides = dice_part.partition('d')
+            if not count.isdigit() or (d and not sides.isdigit()) or (sign and not mod_part.isdigit()):
+                raise ValueError("notation does not match NdM[+/-K]")
+            modifier = (-int(mod_part) if sign == '-' else int(mod_part)) if sign else 0
             
             # Handle dice rolls
-            if 'd' in dice_part:
-                num_dice, sides = map(int, dice_part.split('d'))
-                total = sum(random.randint(1, sides) for _ in range(num_dice))
+            if d:
+                # One choices() call draws every die, instead of a randint() call per die
+                total = sum(random.choices(range(1, int(sides) + 1), k=int(count)))
                 return total + modifier
             else:
-                return int(dice_part) + modifier
+                return int(count) + modifier
         except Exception as e:
             logger.error(f"Failed to roll dice '{dice_str}': {e}")
             raise ValueError(f"Invalid dice notation: {dice_str}")
 
 class Toon:
+    __slots__ = ("data_path", "save_path", "properties", "_saved_snapshot")
+
+    # ((directory, mtime), listing) from the last list_saved_characters call
+    _listing_cache = None
+    # Save file path -> ((mtime, size), summary), so unchanged saves are not re-parsed
+    _summary_cache = {}
+    # Sidecar file in the characters directory that persists _summary_cache
+    # between runs; its name must not end in "json" or it would be listed
+    _SUMMARY_INDEX = ".index"
+
     def __init__(self, load_from: Optional[str] = None):
         """Initialize a new character or load an existing one
         
@@ -54,6 +304,8 @@ class Toon:
         """
         self.data_path = "data"
         self.save_path = "characters"
+        # Serialized properties as of the last save or load; None if never saved
+        self._saved_snapshot = None
         
         # Ensure characters directory exists
         if not os.path.exists(self.save_path):
@@ -68,6 +320,7 @@ class Toon:
 
     def _init_default_properties(self):
         """Initialize default character properties"""
+        now = datetime.now().isoformat()
         self.properties = {
             "name": "",
             "race": "",
@@ -177,8 +430,8 @@ class Toon:
             "classes": [],
             "pending_choices": {},
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "last_modified": datetime.now().isoformat(),
+                "created_at": now,
+                "last_modified": now,
                 "version": "1.0",
                 "save_count": 0  # Initialize save counter
             }
@@ -207,6 +460,9 @@ class Toon:
             
             # Save the character
             save_file(self.properties, self.save_path, filename)
+            self._saved_snapshot = self._snapshot(self.properties)
+            # Overwriting an existing file does not change the directory mtime
+            Toon._listing_cache = None
             logger.info(f"Saved character to {filename}")
             return filename
             
@@ -214,10 +470,27 @@ class Toon:
             logger.error(f"Failed to save character: {e}")
             raise CharacterError(f"Failed to save character: {e}")
 
+    @staticmethod
+    def _snapshot(properties: Dict) -> bytes:
+        """Serialize properties for change detection"""
+        if orjson is not None:
+            return orjson.dumps(properties, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(properties).encode()
+
+    def has_unsaved_changes(self) -> bool:
+        """Check if the character changed since it was last saved or loaded
+        
+        Returns:
+            True if there are changes to save, False otherwise
+        """
+        return self._saved_snapshot is None or self._snapshot(self.properties) != self._saved_snapshot
+
     def _load_character(self, filename: str):
         """Load a character from a file"""
         try:
             data = open_file(filename, self.save_path)
+            # Taken before migration, so migrated files count as changed
+            self._saved_snapshot = self._snapshot(data)
             
             # Validate version compatibility
             if "metadata" not in data or "version" not in data["metadata"]:
@@ -243,6 +516,14 @@ class Toon:
             logger.error(f"Failed to load character from {filename}: {e}")
             raise CharacterError(f"Failed to load character: {e}")
 
+    @staticmethod
+    def _copy_summaries(characters: List[Dict]) -> List[Dict]:
+        """Copy cached character summaries so callers can't alter the caches"""
+        return [
+            {field: list(value) if isinstance(value, list) else value for field, value in summary.items()}
+            for summary in characters
+        ]
+
     @staticmethod
     def list_saved_characters() -> List[Dict[str, str]]:
         """List all saved characters with their basic information
@@ -251,28 +532,94 @@ class Toon:
             List of dictionaries containing character information
         """
         try:
+            # Saving or deleting a character changes the directory mtime
+            directory = PATHS["characters"]
+            key = (directory, os.stat(directory).st_mtime_ns)
+            if Toon._listing_cache and Toon._listing_cache[0] == key:
+                return Toon._copy_summaries(Toon._listing_cache[1])
+            
+            previous = Toon._summary_cache or Toon._load_summary_index(directory)
             characters = []
+            summaries = {}
+            parsed = False
             for filename in list_files("characters", "json"):
                 try:
-                    data = open_file(filename.replace(".json", ""), "characters")
-                    characters.append({
-                        "filename": filename,
-                        "name": data.get("name", "unnamed"),
-                        "race": f"{data.get('race', '')} {data.get('subrace', '')}".strip(),
-                        "level": data.get("level", 0),
-                        "classes": [f"{c['name']} {c['level']}" for c in data.get("classes", [])],
-                        "last_modified": data.get("metadata", {}).get("last_modified", "unknown")
-                    })
+                    path = os.path.join(directory, filename)
+                    st = os.stat(path)
+                    # Size guards against filesystems with coarse mtime resolution
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    cached = previous.get(path)
+                    if cached and cached[0] == stamp:
+                        summary = cached[1]
+                    else:
+                        parsed = True
+                        data = open_file(filename.replace(".json", ""), "characters")
+                        summary = {
+                            "filename": filename,
+                            "name": data.get("name", "unnamed"),
+                            "race": f"{data.get('race', '')} {data.get('subrace', '')}".strip(),
+                            "level": data.get("level", 0),
+                            "classes": [f"{c['name']} {c['level']}" for c in data.get("classes", [])],
+                            "last_modified": data.get("metadata", {}).get("last_modified", "unknown")
+                        }
+                    summaries[path] = (stamp, summary)
+                    characters.append(summary)
                 except Exception as e:
                     logger.warning(f"Skipping corrupted character file {filename}: {e}")
                     continue
             
-            return sorted(characters, key=lambda x: x["last_modified"], reverse=True)
+            # Only keep entries for files that still exist
+            Toon._summary_cache = summaries
+            if parsed or summaries.keys() != previous.keys():
+                Toon._save_summary_index(directory, summaries)
+                # Writing the index changes the directory mtime the cache is keyed on
+                key = (directory, os.stat(directory).st_mtime_ns)
+            characters.sort(key=itemgetter("last_modified"), reverse=True)
+            Toon._listing_cache = (key, characters)
+            return Toon._copy_summaries(characters)
             
         except Exception as e:
             logger.error(f"Failed to list characters: {e}")
             raise CharacterError(f"Failed to list characters: {e}")
 
+    @staticmethod
+    def _load_summary_index(directory: str) -> Dict[str, tuple]:
+        """Load the persisted character summaries, or nothing if unavailable"""
+        try:
+            with open(os.path.join(directory, Toon._SUMMARY_INDEX), 'rb') as f:
+                raw = f.read()
+            entries = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            if not isinstance(entries, dict):
+                raise ValueError("index is not a mapping of file names")
+            index = {}
+            for filename, (stamp, summary) in entries.items():
+                if not isinstance(summary, dict):
+                    raise ValueError(f"malformed entry for {filename}")
+                index[os.path.join(directory, filename)] = (tuple(stamp), summary)
+            return index
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable character index in {directory}: {e}")
+            return {}
+
+    @staticmethod
+    def _save_summary_index(directory: str, summaries: Dict[str, tuple]) -> None:
+        """Persist character summaries next to the save files"""
+        entries = {
+            os.path.basename(path): [list(stamp), summary]
+            for path, (stamp, summary) in summaries.items()
+        }
+        index_path = os.path.join(directory, Toon._SUMMARY_INDEX)
+        try:
+            payload = orjson.dumps(entries) if orjson is not None else json.dumps(entries).encode()
+            # Write then rename so a crash never leaves a half-written index
+            with open(index_path + ".tmp", 'wb') as f:
+                f.write(payload)
+            os.replace(index_path + ".tmp", index_path)
+        except OSError as e:
+            logger.warning(f"Failed to write character index {index_path}: {e}")
+
     def delete_save(self, filename: str) -> bool:
         """Delete a saved character file
         
@@ -285,89 +632,97 @@ class Toon:
         try:
             # Remove .json extension if present, then add it back
             filename = filename.replace('.json', '')
+            Toon._listing_cache = None
             return remove_file(f"{filename}.json", self.save_path)
         except Exception as e:
             logger.error(f"Failed to delete character file {filename}: {e}")
             raise CharacterError(f"Failed to delete character: {e}")
 
-    def export_character_sheet(self, format: str = "text") -> str:
+    def export_character_sheet(self, format: str = "text", output_dir: Optional[str] = None) -> str:
         """Export character sheet in various formats
         
         Args:
             format: The format to export in ("text", "json", "html", "pdf")
+            output_dir: Directory for file exports (html, pdf); defaults to the save path
             
         Returns:
             Formatted character sheet or path to generated file
         """
         try:
             if format == "pdf":
-                return self._export_to_pdf()
+                return self._export_to_pdf(output_dir)
             elif format == "json":
+                if orjson is not None:
+                    # Class feature tables use int level keys, which orjson only accepts with OPT_NON_STR_KEYS
+                    return orjson.dumps(self.properties, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
                 return json.dumps(self.properties, indent=2)
             
             elif format == "text":
                 # Create a text representation of the character sheet
-                sheet = []
-                sheet.append(f"=== {self.properties['name']} ===")
-                sheet.append(f"Race: {self.properties['race']} {self.properties.get('subrace', '')}")
-                sheet.append(f"Level: {self.properties['level']}")
-                sheet.append(f"Classes: {', '.join(f'{c['name']} {c['level']}' for c in self.properties['classes'])}")
+                props = self.properties
+                stats = props["stats"]
+                saves = props["saving_throws"]
+                prof_bonus = props["proficiency_bonus"]
+                # Compute each modifier once; saving throws reuse them
+                mods = {ability: (score - 10) // 2 for ability, score in stats.items()}
                 
-                sheet.append("\nAbility Scores:")
-                for ability, score in self.properties["stats"].items():
-                    modifier = self.get_ability_modifier(ability)
-                    sheet.append(f"{ability.capitalize()}: {score} ({modifier:+d})")
+                sheet = [
+                    f"=== {props['name']} ===",
+                    f"Race: {props['race']} {props.get('subrace', '')}",
+                    f"Level: {props['level']}",
+                    f"Classes: {', '.join(f'{c['name']} {c['level']}' for c in props['classes'])}",
+                    "\nAbility Scores:",
+                ]
+                sheet.extend(f"{ability.capitalize()}: {score} ({_signed(mods[ability])})"
+                             for ability, score in stats.items())
                 
                 sheet.append("\nSaving Throws:")
-                for ability in self.properties["saving_throws"]:
-                    bonus = self.get_saving_throw_bonus(ability)
-                    prof = "✓" if self.properties["saving_throws"][ability] else " "
-                    sheet.append(f"{ability.capitalize()}: {bonus:+d} [{prof}]")
+                sheet.extend(
+                    f"{ability.capitalize()}: {_signed(mods[ability] + (prof_bonus if proficient else 0))} "
+                    f"[{'✓' if proficient else ' '}]"
+                    for ability, proficient in saves.items()
+                )
                 
                 sheet.append("\nProficiencies:")
-                for prof_type, profs in self.properties["proficiencies"].items():
-                    if profs:
-                        sheet.append(f"{prof_type.capitalize()}: {', '.join(profs)}")
+                sheet.extend(f"{prof_type.capitalize()}: {', '.join(profs)}"
+                             for prof_type, profs in props["proficiencies"].items() if profs)
                 
                 return "\n".join(sheet)
             
             elif format == "html":
-                # Set up Jinja2 environment
-                env = Environment(
-                    loader=FileSystemLoader('templates'),
-                    autoescape=True
-                )
-                template = env.get_template('character_sheet.html')
+                template = _get_html_template('character_sheet.html')
+                props = self.properties
+                stats = props['stats']
+                skills = props['skills']
+                spells = props['spells']
+                prof_bonus = props['proficiency_bonus']
+                mods = {ability: (score - 10) // 2 for ability, score in stats.items()}
 
                 # Calculate derived values for the template (reuse PDF helpers)
                 class_levels = {
                     c['name']: c['level'] 
-                    for c in self.properties['classes']
-                }
-                modifiers = {
-                    ability: f"{self.get_ability_modifier(ability):+d}"
-                    for ability in self.properties['stats']
+                    for c in props['classes']
                 }
+                modifiers = {ability: _signed(mod) for ability, mod in mods.items()}
                 saving_throws = {
                     ability: {
-                        'bonus': f"{self.get_saving_throw_bonus(ability):+d}",
-                        'proficient': self.properties['saving_throws'][ability]
+                        'bonus': _signed(mods[ability] + (prof_bonus if proficient else 0)),
+                        'proficient': proficient
                     }
-                    for ability in self.properties['saving_throws']
+                    for ability, proficient in props['saving_throws'].items()
                 }
                 # DEBUG: Log the skills dict before rendering
-                logger.debug(f"Skills dict before rendering: {self.properties['skills']}")
+                logger.debug(f"Skills dict before rendering: {skills}")
                 
                 # Change to include both bonus and proficiency status
                 skill_data = {}
-                for skill, proficient in self.properties['skills'].items():
+                for skill, proficient in skills.items():
                     skill_lc = skill.lower()
-                    ability = self._get_skill_ability(skill_lc)
-                    bonus = self.get_ability_modifier(ability)
+                    bonus = mods[_SKILL_ABILITIES.get(skill_lc, 'intelligence')]
                     if proficient:
-                        bonus += self.properties['proficiency_bonus']
+                        bonus += prof_bonus
                     skill_data[skill_lc] = {
-                        'bonus': f"{bonus:+d}",
+                        'bonus': _signed(bonus),
                         'proficient': proficient
                     }
                 # Format hit dice for display
@@ -379,7 +734,7 @@ class Toon:
                 background_features = []
                 other_features = []
                 
-                for feature in self.properties.get('features', []):
+                for feature in props.get('features', []):
                     source = feature.get('source', '')
                     if source:
                         # Check if this is a background feature
@@ -435,102 +790,98 @@ class Toon:
                 combat_features = parse_features_str(combat_features_str)
                 non_combat_features = parse_features_str(non_combat_features_str)
                 # Personality as lists
-                personality = self.properties.get('personality', {})
+                personality = props.get('personality', {})
                 # Proficiencies
-                proficiencies = self.properties['proficiencies']
+                proficiencies = props['proficiencies']
                 # Currency
-                currency = self.properties.get('currency', {})
+                currency = props.get('currency', {})
                 # Passive Perception
-                passive_perception = 10 + self.get_ability_modifier('wisdom')
-                if self.properties['skills'].get('perception', False):
-                    passive_perception += self.properties['proficiency_bonus']
+                passive_perception = 10 + mods['wisdom']
+                if skills.get('perception', False):
+                    passive_perception += prof_bonus
                 # Passive Investigation
-                passive_investigation = 10 + self.get_ability_modifier('intelligence')
-                if self.properties['skills'].get('investigation', False):
-                    passive_investigation += self.properties['proficiency_bonus']
+                passive_investigation = 10 + mods['intelligence']
+                if skills.get('investigation', False):
+                    passive_investigation += prof_bonus
                 # Passive Insight
-                passive_insight = 10 + self.get_ability_modifier('wisdom')
-                if self.properties['skills'].get('insight', False):
-                    passive_insight += self.properties['proficiency_bonus']
+                passive_insight = 10 + mods['wisdom']
+                if skills.get('insight', False):
+                    passive_insight += prof_bonus
                 # Death saves
-                death_saves = self.properties.get('death_saves', {'successes': 0, 'failures': 0})
+                death_saves = props.get('death_saves', {'successes': 0, 'failures': 0})
                 # Metadata
-                metadata = self.properties.get('metadata', {})
+                metadata = props.get('metadata', {})
                 # Spellcasting
                 spell_save_dc = None
                 spell_attack_bonus = None
                 spellcasting_data = None
-                spell_ability = self.properties['spells']['spellcasting_ability']
+                spell_ability = spells['spellcasting_ability']
                 
                 # Check if character has any spellcasting (racial or class)
-                has_cantrips = bool(self.properties['spells'].get('cantrips', []))
-                has_spells = bool(self.properties['spells'].get('spells_known', []))
-                has_class_spellcasting = False
-                try:
-                    has_class_spellcasting = any(
-                        'spellcasting' in self._load_data_file('classes', c['name']) 
-                        for c in self.properties.get('classes', [])
-                        if c['name']
-                    )
-                except:
-                    pass
+                has_cantrips = bool(spells.get('cantrips', []))
+                has_spells = bool(spells.get('spells_known', []))
+                # One pass over the class data covers the check, cantrips and slots
+                class_spellcasting = self._spellcasting_snapshot()
                 
-                if spell_ability or has_cantrips or has_spells or has_class_spellcasting:
+                if spell_ability or has_cantrips or has_spells or class_spellcasting['has']:
                     # If we have spellcasting ability, calculate bonuses
                     if spell_ability:
-                        modifier = self.get_ability_modifier(spell_ability)
-                        spell_save_dc = 8 + self.properties['proficiency_bonus'] + modifier
-                        spell_attack_bonus = modifier + self.properties['proficiency_bonus']
+                        modifier = mods.get(spell_ability.lower())
+                        if modifier is None:
+                            modifier = self.get_ability_modifier(spell_ability)
+                        spell_save_dc = 8 + prof_bonus + modifier
+                        spell_attack_bonus = modifier + prof_bonus
                     
                     # Get cantrips known and spell slots
-                    cantrips_known = self._get_cantrips_known_for_level()
-                    spell_slots = self._get_spell_slots_for_level()
+                    cantrips_known = class_spellcasting['cantrips_known']
+                    spell_slots = class_spellcasting['spell_slots']
                     
                     # For racial-only spellcasting, count actual cantrips
-                    if not cantrips_known.get(self.properties['level'], 0) and has_cantrips:
-                        cantrips_known[self.properties['level']] = len(self.properties['spells'].get('cantrips', []))
+                    char_level = props['level']
+                    if not cantrips_known.get(char_level, 0) and has_cantrips:
+                        cantrips_known[char_level] = len(spells.get('cantrips', []))
                     
                     # Construct spellcasting object for template
                     spellcasting_data = {
                         'ability': spell_ability or 'none',
                         'spell_attack_bonus': spell_attack_bonus,
                         'spell_save_dc': spell_save_dc,
-                        'focus': self.properties['spells'].get('focus', []),
+                        'focus': spells.get('focus', []),
                         'cantrips_known': cantrips_known,
                         'spell_slots_per_level': spell_slots
                     }
                 # Prepare template data
                 template_data = {
                     'character': {
-                        'name': self.properties['name'],
-                        'race': f"{self.properties['race']} {self.properties.get('subrace', '')}".strip(),
+                        'name': props['name'],
+                        'race': f"{props['race']} {props.get('subrace', '')}".strip(),
                         'class_levels': class_levels,
-                        'level': self.properties['level'],
-                        'background': self.properties.get('background', ''),
-                        'alignment': self.properties.get('alignment', ''),
-                        'experience': self.properties.get('experience', 0),
-                        'proficiency_bonus': self.properties['proficiency_bonus'],
-                        'inspiration': self.properties.get('inspiration', False),
-                        'stats': self.properties['stats'],
+                        'level': props['level'],
+                        'background': props.get('background', ''),
+                        'alignment': props.get('alignment', ''),
+                        'experience': props.get('experience', 0),
+                        'proficiency_bonus': prof_bonus,
+                        'inspiration': props.get('inspiration', False),
+                        'stats': stats,
                         'modifiers': modifiers,
                         'saving_throws': saving_throws,
                         'skills': skill_data,
-                        'armor_class': self.properties['armor_class'],
-                        'initiative': self.properties['initiative'],
-                        'speed': self.properties['speed'],
-                        'hit_points': self.properties['hit_points'],
+                        'armor_class': props['armor_class'],
+                        'initiative': props['initiative'],
+                        'speed': props['speed'],
+                        'hit_points': props['hit_points'],
                         'hit_dice': hit_dice_summary,
                         'proficiencies': proficiencies,
                         'features': combat_features + non_combat_features,
                         'background_features': background_features,
                         'other_features': other_features,
                         'class_features': class_features,
-                        'subclass_features': self.properties.get('subclass_features', {}),
-                        'spells': self.properties['spells'],
+                        'subclass_features': props.get('subclass_features', {}),
+                        'spells': spells,
                         'spellcasting': spellcasting_data,
                         'spell_save_dc': spell_save_dc,
                         'spell_attack_bonus': spell_attack_bonus,
-                        'equipment': self.properties.get('equipment', []),
+                        'equipment': props.get('equipment', []),
                         'currency': currency,
                         'personality': personality,
                         'death_saves': death_saves,
@@ -541,13 +892,9 @@ class Toon:
                     }
                 }
                 
-                # Render the template
-                rendered_html = template.render(**template_data)
-                
-                # Save the rendered HTML to a file
-                output_path = os.path.join(self.save_path, f"{self.properties['name'].replace(' ', '_')}_sheet.html")
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(rendered_html)
+                # Render the template straight to the output file
+                output_path = self._sheet_path(output_dir, 'html')
+                template.stream(**template_data).dump(output_path, encoding='utf-8')
                 
                 return output_path
             
@@ -558,87 +905,100 @@ class Toon:
             logger.error(f"Failed to export character sheet: {e}")
             raise
 
+    def _sheet_path(self, output_dir: Optional[str], extension: str) -> str:
+        """Get the file a sheet export writes to, named after the character"""
+        filename = f"{self.properties['name'].replace(' ', '_')}_sheet.{extension}"
+        return os.path.join(output_dir or self.save_path, filename)
+
+    @staticmethod
+    def export_many(characters: List["Toon"], format: str = "pdf", output_dir: Optional[str] = None,
+                    max_workers: Optional[int] = None) -> List[str]:
+        """Export several character sheets concurrently
+        
+        Each sheet is exported with export_character_sheet on a worker thread,
+        so pdftk runs for several characters at once and the cached templates
+        are shared. File exports are refused up front if two characters would
+        write the same sheet.
+        
+        Args:
+            characters: Characters to export
+            format: The format to export in ("text", "json", "html", "pdf")
+            output_dir: Directory for file exports (html, pdf); defaults to each save path
+            max_workers: Maximum number of concurrent exports; defaults to the CPU count
+            
+        Returns:
+            Export results in the same order as characters
+        """
+        characters = list(characters)
+        if not characters:
+            return []
+        if format in ("html", "pdf"):
+            # Two exports to one file would race on it and overwrite each other
+            targets = Counter(os.path.abspath(toon._sheet_path(output_dir, format)) for toon in characters)
+            duplicates = sorted(path for path, count in targets.items() if count > 1)
+            if duplicates:
+                raise CharacterError(f"Several characters would export to the same file: {', '.join(duplicates)}")
+        workers = min(max_workers or os.cpu_count() or 1, len(characters))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda toon: toon.export_character_sheet(format, output_dir), characters
+            ))
+
     def _get_skill_ability(self, skill: str) -> str:
         """Get the ability score associated with a skill"""
-        # D&D 5E skill to ability score mapping
-        skill_abilities = {
-            'acrobatics': 'dexterity',
-            'animal handling': 'wisdom',
-            'arcana': 'intelligence',
-            'athletics': 'strength',
-            'deception': 'charisma',
-            'history': 'intelligence',
-            'insight': 'wisdom',
-            'intimidation': 'charisma',
-            'investigation': 'intelligence',
-            'medicine': 'wisdom',
-            'nature': 'intelligence',
-            'perception': 'wisdom',
-            'performance': 'charisma',
-            'persuasion': 'charisma',
-            'religion': 'intelligence',
-            'sleight of hand': 'dexterity',
-            'stealth': 'dexterity',
-            'survival': 'wisdom'
-        }
-        return skill_abilities.get(skill.lower(), 'intelligence')  # Default to INT if unknown
+        return _SKILL_ABILITIES.get(skill.lower(), 'intelligence')  # Default to INT if unknown
 
-    def _get_cantrips_known_for_level(self) -> Dict[int, int]:
-        """Get cantrips known progression based on current level and classes"""
-        cantrips_known = {}
-        current_level = self.properties.get('level', 1)
-        
-        # Count racial cantrips
-        racial_cantrips = len([c for c in self.properties.get('spells', {}).get('cantrips', []) 
-                              if c.get('source') == 'racial'])
+    def _spellcasting_snapshot(self) -> Dict:
+        """Gather class spellcasting details in a single pass over the classes
         
-        # Check each class for spellcasting
+        Returns:
+            Dictionary with 'has' (any class casts spells), 'cantrips_known'
+            and 'spell_slots', both keyed by the current character level
+        """
+        current_level = self.properties.get('level', 1)
+        level_str = str(current_level)
+        has_spellcasting = False
         class_cantrips_count = 0
+        level_slots = None
+        
         for class_info in self.properties.get('classes', []):
             class_name = class_info['name']
+            if not class_name:
+                continue
             try:
-                class_data = self._load_data_file("classes", class_name)
-                if 'spellcasting' in class_data and 'cantrips_known' in class_data['spellcasting']:
-                    class_cantrips = class_data['spellcasting']['cantrips_known']
-                    # Get the highest applicable level
-                    for level in sorted(class_cantrips.keys(), key=int, reverse=True):
-                        if int(level) <= current_level:
-                            class_cantrips_count = class_cantrips[level]
-                            break
+                spellcasting = self._load_data_file("classes", class_name).get('spellcasting')
+                if spellcasting is None:
+                    continue
+                has_spellcasting = True
+                
+                # Slots come from the first class with an entry for the current level
+                if level_slots is None:
+                    level_slots = spellcasting.get('spell_slots_per_level', {}).get(level_str)
+                
+                # Cantrips come from the highest applicable level of the last caster class
+                class_cantrips = spellcasting.get('cantrips_known', {})
+                applicable = [level for level in class_cantrips if int(level) <= current_level]
+                if applicable:
+                    class_cantrips_count = class_cantrips[max(applicable, key=int)]
             except:
                 continue
         
         # Total cantrips is racial + class
-        total_cantrips = racial_cantrips + class_cantrips_count
-        cantrips_known[current_level] = total_cantrips
-            
-        return cantrips_known
+        racial_cantrips = sum(1 for c in self.properties.get('spells', {}).get('cantrips', [])
+                              if c.get('source') == 'racial')
+        return {
+            'has': has_spellcasting,
+            'cantrips_known': {current_level: racial_cantrips + class_cantrips_count},
+            'spell_slots': {current_level: level_slots if level_slots is not None else {}}
+        }
+
+    def _get_cantrips_known_for_level(self) -> Dict[int, int]:
+        """Get cantrips known progression based on current level and classes"""
+        return self._spellcasting_snapshot()['cantrips_known']
 
     def _get_spell_slots_for_level(self) -> Dict[int, Dict[int, int]]:
         """Get spell slots progression based on current level and classes"""
-        spell_slots = {}
-        current_level = self.properties.get('level', 1)
-        
-        # Check each class for spellcasting
-        for class_info in self.properties.get('classes', []):
-            class_name = class_info['name']
-            try:
-                class_data = self._load_data_file("classes", class_name)
-                if 'spellcasting' in class_data and 'spell_slots_per_level' in class_data['spellcasting']:
-                    class_slots = class_data['spellcasting']['spell_slots_per_level']
-                    # Get slots for current level
-                    level_str = str(current_level)
-                    if level_str in class_slots:
-                        spell_slots[current_level] = class_slots[level_str]
-                        break
-            except:
-                continue
-        
-        # If no class spellcasting found, return empty dict
-        if not spell_slots:
-            spell_slots[current_level] = {}
-            
-        return spell_slots
+        return self._spellcasting_snapshot()['spell_slots']
 
     def create_backup(self) -> str:
         """Create a backup of the character
@@ -674,8 +1034,7 @@ class Toon:
         """Load a data file from the appropriate category"""
         try:
             file_path = os.path.join(self.data_path, category, f"{name.lower()}.json")
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            data = read_data_file(file_path)
             logger.debug(f"Loaded {category} data for {name}")
             return data
         except FileNotFoundError:
@@ -708,9 +1067,10 @@ class Toon:
             if "tool_proficiencies" in grants:
                 self.properties["proficiencies"]["tools"].extend(grants["tool_proficiencies"])
 
-            # Remove any duplicates from proficiency lists
-            for prof_type in ["weapons", "armor", "tools", "languages"]:
-                self.properties["proficiencies"][prof_type] = list(set(self.properties["proficiencies"][prof_type]))
+            # Remove any duplicates from proficiency lists, keeping first-seen order
+            proficiencies = self.properties["proficiencies"]
+            for prof_type in ("weapons", "armor", "tools", "languages"):
+                proficiencies[prof_type] = list(dict.fromkeys(proficiencies[prof_type]))
 
             logger.debug(f"Applied trait grants: {grants}")
 
@@ -724,8 +1084,7 @@ class Toon:
             if "modifies" in trait:
                 for path, value in trait["modifies"].items():
                     # Handle dot notation for nested properties
-                    parts = path.split('.')
-                    target = self.properties
+                    parts = _split_path(path)
                     
                     # Special handling for trait modifications
                     if parts[0] == "traits":
@@ -739,22 +1098,20 @@ class Toon:
                                 break
                         continue
                     
-                    # Handle regular nested dictionary paths
+                    # Handle regular nested dictionary paths, remembering the parent
+                    parent, key = None, None
+                    target = self.properties
                     for part in parts[:-1]:
-                        if part not in target:
-                            target[part] = {}
-                        target = target[part]
+                        parent, key = target, part
+                        target = target.setdefault(part, {})
                     
                     # Set the final value
                     if isinstance(target, dict):
                         target[parts[-1]] = value
                     else:
-                        # If we're trying to modify a non-dict value, set it in the parent
-                        parent_parts = parts[:-1]
-                        parent = self.properties
-                        for part in parent_parts[:-1]:
-                            parent = parent[part]
-                        parent[parent_parts[-1]] = value
+                        # A plain value sits where a dict was expected (e.g. "speed.walk"
+                        # with an int speed), so replace it in the parent
+                        parent[key] = value
                     
                 logger.debug(f"Applied trait modifications: {trait['modifies']}")
         except Exception as e:
@@ -826,8 +1183,10 @@ class Toon:
             race_data = self._load_data_file("races", race)
             
             # Validate subrace if provided
-            if subrace and subrace not in [sr["name"] for sr in race_data.get("subraces", [])]:
-                raise ValueError(f"Invalid subrace {subrace} for race {race}")
+            if subrace:
+                subraces = {sr["name"]: sr for sr in race_data.get("subraces", [])}
+                if subrace not in subraces:
+                    raise ValueError(f"Invalid subrace {subrace} for race {race}")
             
             # Set basic race properties
             self.properties["race"] = race_data["name"]
@@ -868,7 +1227,7 @@ class Toon:
             # Apply subrace if specified
             if subrace:
                 self.properties["subrace"] = subrace
-                subrace_data = next(sr for sr in race_data["subraces"] if sr["name"] == subrace)
+                subrace_data = subraces[subrace]
                 
                 # Handle subrace ability scores
                 if "ability_scores" in subrace_data:
@@ -1259,18 +1618,21 @@ class Toon:
             
             # Add features
             if "features" in class_data:
+                class_key = class_name.lower()
+                character_features = self.properties["features"]
+                pending_choices = self.properties["pending_choices"]
                 for level_str, features in class_data["features"].items():
-                    feature_level = int(level_str)
-                    if feature_level <= level:
+                    if int(level_str) <= level:
+                        source = f"{class_data['name']} {level_str}"
                         for feature in features:
                             # All features should have mechanics in standardized format
                             mechanics = feature.get("mechanics", {})
                             if not mechanics:
                                 # If no mechanics, just store the feature name and description
-                                self.properties["features"].append({
+                                character_features.append({
                                     "name": feature.get("name", ""),
                                     "description": feature.get("description", ""),
-                                    "source": f"{class_data['name']} {level_str}"
+                                    "source": source
                                 })
                                 continue
                                 
@@ -1278,8 +1640,8 @@ class Toon:
                             
                             # Handle ability score improvements
                             if mechanics_type == "ability_score_improvement":
-                                choice_key = f"class_{class_name.lower()}_{level_str}_asi"
-                                self.properties["pending_choices"][choice_key] = {
+                                choice_key = f"class_{class_key}_{level_str}_asi"
+                                pending_choices[choice_key] = {
                                     "type": "ability_score_improvement",
                                     "count": mechanics.get("count", 2),  # Default to 2 increases
                                     "amount": mechanics.get("amount", 1),  # Default to +1 per increase
@@ -1289,8 +1651,8 @@ class Toon:
                             
                             # Handle expertise
                             elif mechanics_type == "expertise":
-                                choice_key = f"class_{class_name.lower()}_{level_str}_expertise"
-                                self.properties["pending_choices"][choice_key] = {
+                                choice_key = f"class_{class_key}_{level_str}_expertise"
+                                pending_choices[choice_key] = {
                                     "type": "expertise",
                                     "count": mechanics.get("count", 2),  # Default to 2 if not specified
                                     "options": mechanics.get("options", []),
@@ -1312,8 +1674,8 @@ class Toon:
                                     cantrips_count = mechanics["cantrips_known"].get(str(level), 0)
                                     if cantrips_count > 0:
                                         self.properties["spells"]["cantrips"].extend([{"name": "", "description": ""}] * cantrips_count)
-                                        choice_key = f"class_{class_name.lower()}_{level_str}_cantrips"
-                                        self.properties["pending_choices"][choice_key] = {
+                                        choice_key = f"class_{class_key}_{level_str}_cantrips"
+                                        pending_choices[choice_key] = {
                                             "type": "cantrips",
                                             "count": cantrips_count,
                                             "class": class_name,
@@ -1325,8 +1687,8 @@ class Toon:
                                     spells_known_count = mechanics["spells_known"].get(str(level), 0)
                                     if spells_known_count > 0:
                                         self.properties["spells"]["spells_known"].extend([{"name": "", "description": ""}] * spells_known_count)
-                                        choice_key = f"class_{class_name.lower()}_{level_str}_spells"
-                                        self.properties["pending_choices"][choice_key] = {
+                                        choice_key = f"class_{class_key}_{level_str}_spells"
+                                        pending_choices[choice_key] = {
                                             "type": "spells",
                                             "count": spells_known_count,
                                             "class": class_name,
@@ -1342,33 +1704,12 @@ class Toon:
                                         if slot_level not in current_slots or current_slots[slot_level] < count:
                                             current_slots[slot_level] = count
                             
-                            # Handle resource-based features
-                            elif mechanics_type == "resource":
-                                feature_copy = feature.copy()
-                                feature_copy["source"] = f"{class_data['name']} {level_str}"
-                                feature_copy["mechanics"] = mechanics
-                                self.properties["features"].append(feature_copy)
-                            
-                            # Handle passive features
-                            elif mechanics_type == "passive":
-                                feature_copy = feature.copy()
-                                feature_copy["source"] = f"{class_data['name']} {level_str}"
-                                feature_copy["mechanics"] = mechanics
-                                self.properties["features"].append(feature_copy)
-                            
-                            # Handle action features
-                            elif mechanics_type == "action":
-                                feature_copy = feature.copy()
-                                feature_copy["source"] = f"{class_data['name']} {level_str}"
-                                feature_copy["mechanics"] = mechanics
-                                self.properties["features"].append(feature_copy)
-                            
-                            # Handle all other features
+                            # Resource, passive, action and all other features are stored as-is
                             else:
                                 feature_copy = feature.copy()
-                                feature_copy["source"] = f"{class_data['name']} {level_str}"
+                                feature_copy["source"] = source
                                 feature_copy["mechanics"] = mechanics
-                                self.properties["features"].append(feature_copy)
+                                character_features.append(feature_copy)
             
             logger.info(f"Added class {class_name} at level {level}")
             
@@ -1379,18 +1720,18 @@ class Toon:
     def set_ability_scores(self, scores: Dict[str, int]):
         """Set base ability scores and update dependent values"""
         try:
-            valid_abilities = {"strength", "dexterity", "constitution", 
-                             "intelligence", "wisdom", "charisma"}
-            
             # Validate scores
-            if not all(8 <= score <= 20 for score in scores.values()):
-                raise ValueError("Ability scores must be between 8 and 20")
-            if not all(ability.lower() in valid_abilities for ability in scores):
-                raise ValueError("Invalid ability score name")
+            normalized = {}
+            for ability, score in scores.items():
+                if not 8 <= score <= 20:
+                    raise ValueError("Ability scores must be between 8 and 20")
+                ability = ability.lower()
+                if ability not in _VALID_ABILITIES:
+                    raise ValueError("Invalid ability score name")
+                normalized[ability] = score
             
             # Set base scores
-            for ability, score in scores.items():
-                self.properties["base_stats"][ability.lower()] = score
+            self.properties["base_stats"].update(normalized)
             
             # Recalculate final stats with all bonuses
             self._recalculate_final_stats()
@@ -1447,39 +1788,25 @@ class Toon:
             Dictionary of field names and their types
         """
         try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(pdf_path, strict=False)
-            fields = {}
-            
-            if '/AcroForm' in reader.trailer['/Root']:
-                form = reader.trailer['/Root']['/AcroForm']
-                field_objects = form.get('/Fields', [])
-                for field in field_objects:
-                    field_obj = field.get_object()
-                    field_name = field_obj.get('/T')
-                    field_type = field_obj.get('/FT')
-                    fields[field_name] = field_type
-                    logger.debug(f"Found field: {field_name} of type {field_type}")
-            
-            return fields
+            # Keyed on mtime so an edited template is read again
+            fields = _read_pdf_form_fields(pdf_path, os.stat(pdf_path).st_mtime_ns)
+            return dict(fields)
         except Exception as e:
             logger.error(f"Failed to get PDF field names: {e}")
             return {}
 
-    def _export_to_pdf(self) -> str:
+    def _export_to_pdf(self, output_dir: Optional[str] = None) -> str:
         """Export character data to a fillable PDF character sheet
         
+        Args:
+            output_dir: Directory to write the PDF to; defaults to the save path
+            
         Returns:
             Path to the generated PDF file
         """
         try:
-            import os
-            import subprocess
-            import tempfile
-            from collections import defaultdict
-            
             # Path to the blank character sheet template
-            template_path = os.path.join('templates', '5E_CharacterSheet_Fillable.pdf')
+            template_path = _PDF_TEMPLATE_PATH
             if not os.path.exists(template_path):
                 raise CharacterError(f"PDF template not found at {template_path}")
             
@@ -1489,21 +1816,34 @@ class Toon:
             # Format features and traits
             combat_text, non_combat_text = self._format_features_for_pdf()
             
+            props = self.properties
+            stats = props['stats']
+            skills = props['skills']
+            saving_throws = props['saving_throws']
+            prof_bonus = props['proficiency_bonus']
+            mods = {ability: (score - 10) // 2 for ability, score in stats.items()}
+            saves = {
+                ability: mods[ability] + (prof_bonus if proficient else 0)
+                for ability, proficient in saving_throws.items()
+            }
+            personality = props.get('personality', {})
+            proficiencies = props['proficiencies']
+            
             # Create output filename based on character name
-            output_path = os.path.join('characters', f"{self.properties['name'].replace(' ', '_')}_sheet.pdf")
+            output_path = self._sheet_path(output_dir, 'pdf')
             
             # Create a temporary FDF file with form field data
             field_data = {
                 # Basic Information
-                'CharacterName': self.properties['name'],
-                'CharacterName 2': self.properties['name'],  # Character name on page 2
-                'ClassLevel': ', '.join(f"{c['name']} {c['level']}" for c in self.properties['classes']),
-                'Race ': f"{self.properties['race']} {self.properties.get('subrace', '')}".strip(),  # Note the space after 'Race'
-                'Background': self.properties.get('background', '').capitalize(),  # Capitalize background
-                'Alignment': self.properties.get('alignment', ''),
-                'XP': str(self.properties.get('experience', 0)),
-                'ProfBonus': f"+{self.properties['proficiency_bonus']}",
-                'Inspiration': '1' if self.properties.get('inspiration', False) else '0',
+                'CharacterName': props['name'],
+                'CharacterName 2': props['name'],  # Character name on page 2
+                'ClassLevel': ', '.join(f"{c['name']} {c['level']}" for c in props['classes']),
+                'Race ': f"{props['race']} {props.get('subrace', '')}".strip(),  # Note the space after 'Race'
+                'Background': props.get('background', '').capitalize(),  # Capitalize background
+                'Alignment': props.get('alignment', ''),
+                'XP': str(props.get('experience', 0)),
+                'ProfBonus': _signed(prof_bonus),
+                'Inspiration': '1' if props.get('inspiration', False) else '0',
                 
                 # Hit Dice
                 'HDTotal': hit_dice_total,
@@ -1514,244 +1854,123 @@ class Toon:
                 'Feat+Traits': non_combat_text,
 
                 # Handle spellcasting classes
-                'Spellcasting Class 2': '',  # Initialize secondary spellcasting fields
+                'Spellcasting Class 2': '',  # Blank unless a spellcasting class fills them
                 'SpellcastingAbility 2': '',
                 'SpellSaveDC  2': '',  # Note: two spaces in field name
                 'SpellAtkBonus 2': '',
 
                 # Personality
-                'PersonalityTraits ': '\\n'.join(self.properties.get('personality', {}).get('traits', [])),  # Note the space after field name
-                'Ideals': '\\n'.join(self.properties.get('personality', {}).get('ideals', [])),
-                'Bonds': '\\n'.join(self.properties.get('personality', {}).get('bonds', [])),
-                'Flaws': '\\n'.join(self.properties.get('personality', {}).get('flaws', [])),
+                'PersonalityTraits ': '\\n'.join(personality.get('traits', [])),  # Note the space after field name
+                'Ideals': '\\n'.join(personality.get('ideals', [])),
+                'Bonds': '\\n'.join(personality.get('bonds', [])),
+                'Flaws': '\\n'.join(personality.get('flaws', [])),
                 
                 # Proficiencies & Languages
-                'ProficienciesLang': (
-                    'LANGUAGES:\\n' + 
-                    ', '.join(self.properties['proficiencies']['languages']) + 
-                    '\\n\\n' +
-                    'ARMOR PROFICIENCIES:\\n' + 
-                    ', '.join(self.properties['proficiencies']['armor']) + 
-                    '\\n\\n' +
-                    'WEAPON PROFICIENCIES:\\n' + 
-                    ', '.join(self.properties['proficiencies']['weapons']) + 
-                    '\\n\\n' +
-                    'TOOL PROFICIENCIES:\\n' + 
-                    ', '.join(self.properties['proficiencies']['tools'])
+                'ProficienciesLang': '\\n\\n'.join(
+                    f"{heading}:\\n{', '.join(proficiencies[key])}"
+                    for heading, key in _PDF_PROFICIENCY_SECTIONS
                 )
             }
 
             # Calculate Passive Perception (10 + Wisdom modifier + proficiency if proficient)
-            passive_perception = 10 + self.get_ability_modifier('wisdom')
-            if self.properties['skills'].get('perception', False):
-                passive_perception += self.properties['proficiency_bonus']
-            # Passive Investigation
-            passive_investigation = 10 + self.get_ability_modifier('intelligence')
-            if self.properties['skills'].get('investigation', False):
-                passive_investigation += self.properties['proficiency_bonus']
-            # Passive Insight
-            passive_insight = 10 + self.get_ability_modifier('wisdom')
-            if self.properties['skills'].get('insight', False):
-                passive_insight += self.properties['proficiency_bonus']
+            passive_perception = 10 + mods['wisdom']
+            if skills.get('perception', False):
+                passive_perception += prof_bonus
             field_data['Passive'] = str(passive_perception)
 
-            # Ability scores and modifiers
+            # Combat stats
             field_data.update({
-                'STR': str(self.properties['stats']['strength']),
-                'STRmod': f"{self.get_ability_modifier('strength'):+d}",
-                'DEX': str(self.properties['stats']['dexterity']),
-                'DEXmod': f"{self.get_ability_modifier('dexterity'):+d}",
-                'CON': str(self.properties['stats']['constitution']),
-                'CONmod': f"{self.get_ability_modifier('constitution'):+d}",
-                'INT': str(self.properties['stats']['intelligence']),
-                'INTmod': f"{self.get_ability_modifier('intelligence'):+d}",
-                'WIS': str(self.properties['stats']['wisdom']),
-                'WISmod': f"{self.get_ability_modifier('wisdom'):+d}",
-                'CHA': str(self.properties['stats']['charisma']),
-                'CHAmod': f"{self.get_ability_modifier('charisma'):+d}",
-                
-                # Saving throws
-                'ST Strength': f"{self.get_saving_throw_bonus('strength'):+d}",
-                'ST Dexterity': f"{self.get_saving_throw_bonus('dexterity'):+d}",
-                'ST Constitution': f"{self.get_saving_throw_bonus('constitution'):+d}",
-                'ST Intelligence': f"{self.get_saving_throw_bonus('intelligence'):+d}",
-                'ST Wisdom': f"{self.get_saving_throw_bonus('wisdom'):+d}",
-                'ST Charisma': f"{self.get_saving_throw_bonus('charisma'):+d}",
-                
-                # Combat stats
-                'AC': str(self.properties.get('armor_class', 10)),
-                'Initiative': f"{self.get_ability_modifier('dexterity'):+d}",
-                'Speed': str(self.properties.get('speed', 30)),
-                'HPMax': str(self.properties['hit_points'].get('maximum', 0)),
+                'AC': str(props.get('armor_class', 10)),
+                'Initiative': _signed(mods['dexterity']),
+                'Speed': str(props.get('speed', 30)),
+                'HPMax': str(props['hit_points'].get('maximum', 0)),
                 'HPCurrent': '',
-                'HPTemp': '',
-                
-                # Skills
-                'Acrobatics': f"{self._get_skill_bonus('acrobatics'):+d}",
-                'Animal': f"{self._get_skill_bonus('animal handling'):+d}",
-                'Arcana': f"{self._get_skill_bonus('arcana'):+d}",
-                'Athletics': f"{self._get_skill_bonus('athletics'):+d}",
-                'Deception ': f"{self._get_skill_bonus('deception'):+d}",  # Note: space after name matches PDF field
-                'History ': f"{self._get_skill_bonus('history'):+d}",  # Note: space after name matches PDF field
-                'Insight': f"{self._get_skill_bonus('insight'):+d}",
-                'Intimidation': f"{self._get_skill_bonus('intimidation'):+d}",
-                'Investigation ': f"{self._get_skill_bonus('investigation'):+d}",  # Note: space after name matches PDF field
-                'Medicine': f"{self._get_skill_bonus('medicine'):+d}",
-                'Nature': f"{self._get_skill_bonus('nature'):+d}",
-                'Perception ': f"{self._get_skill_bonus('perception'):+d}",  # Note: space after name matches PDF field
-                'Performance': f"{self._get_skill_bonus('performance'):+d}",
-                'Persuasion': f"{self._get_skill_bonus('persuasion'):+d}",
-                'Religion': f"{self._get_skill_bonus('religion'):+d}",
-                'SleightofHand': f"{self._get_skill_bonus('sleight of hand'):+d}",
-                'Stealth ': f"{self._get_skill_bonus('stealth'):+d}",  # Note: space after name matches PDF field
-                'Survival': f"{self._get_skill_bonus('survival'):+d}",
-                
-                # Skill proficiency checkboxes - using exact PDF field names
-                'Check Box 23': 'Yes' if self.properties['skills'].get('acrobatics', False) else 'Off',
-                'Check Box 24': 'Yes' if self.properties['skills'].get('animal handling', False) else 'Off',
-                'Check Box 25': 'Yes' if self.properties['skills'].get('arcana', False) else 'Off',
-                'Check Box 26': 'Yes' if self.properties['skills'].get('athletics', False) else 'Off',
-                'Check Box 27': 'Yes' if self.properties['skills'].get('deception', False) else 'Off',
-                'Check Box 28': 'Yes' if self.properties['skills'].get('history', False) else 'Off',
-                'Check Box 29': 'Yes' if self.properties['skills'].get('insight', False) else 'Off',
-                'Check Box 30': 'Yes' if self.properties['skills'].get('intimidation', False) else 'Off',
-                'Check Box 31': 'Yes' if self.properties['skills'].get('investigation', False) else 'Off',
-                'Check Box 32': 'Yes' if self.properties['skills'].get('medicine', False) else 'Off',
-                'Check Box 33': 'Yes' if self.properties['skills'].get('nature', False) else 'Off',
-                'Check Box 34': 'Yes' if self.properties['skills'].get('perception', False) else 'Off',
-                'Check Box 35': 'Yes' if self.properties['skills'].get('performance', False) else 'Off',
-                'Check Box 36': 'Yes' if self.properties['skills'].get('persuasion', False) else 'Off',
-                'Check Box 37': 'Yes' if self.properties['skills'].get('religion', False) else 'Off',
-                'Check Box 38': 'Yes' if self.properties['skills'].get('sleight of hand', False) else 'Off',
-                'Check Box 39': 'Yes' if self.properties['skills'].get('stealth', False) else 'Off',
-                'Check Box 40': 'Yes' if self.properties['skills'].get('survival', False) else 'Off',
-                
-                # Saving throw proficiency checkboxes
-                'Check Box 11': 'Yes' if self.properties['saving_throws']['strength'] else 'Off',
-                'Check Box 18': 'Yes' if self.properties['saving_throws']['dexterity'] else 'Off',
-                'Check Box 19': 'Yes' if self.properties['saving_throws']['constitution'] else 'Off',
-                'Check Box 20': 'Yes' if self.properties['saving_throws']['intelligence'] else 'Off',
-                'Check Box 21': 'Yes' if self.properties['saving_throws']['wisdom'] else 'Off',
-                'Check Box 22': 'Yes' if self.properties['saving_throws']['charisma'] else 'Off',
+                'HPTemp': ''
             })
+            
+            # Ability scores, modifiers, saving throws and save proficiency checkboxes
+            for ability, score_field, mod_field, save_field, checkbox_field in _PDF_ABILITY_FIELDS:
+                field_data[score_field] = str(stats[ability])
+                field_data[mod_field] = _signed(mods[ability])
+                field_data[save_field] = _signed(saves[ability])
+                field_data[checkbox_field] = 'Yes' if saving_throws[ability] else 'Off'
+            
+            # Skill bonuses and proficiency checkboxes
+            for skill, bonus_field, checkbox_field in _PDF_SKILL_FIELDS:
+                proficient = skills.get(skill, False)
+                field_data[bonus_field] = _signed(mods[_SKILL_ABILITIES[skill]] + (prof_bonus if proficient else 0))
+                field_data[checkbox_field] = 'Yes' if proficient else 'Off'
                 
-            # Calculate spellcasting values if applicable
+            # Calculate spellcasting values if applicable; stop loading class data
+            # once every spellcasting block on the sheet is filled
             spellcasting_classes = []
-            for class_info in self.properties['classes']:
+            for class_info in props['classes']:
                 class_data = self._load_data_file('classes', class_info['name'])
                 if 'spellcasting' in class_data:
-                    spellcasting_classes.append({
-                        'name': class_info['name'],
-                        'ability': class_data['spellcasting']['ability'],
-                        'level': class_info['level']
-                    })
-
-            # Handle up to two spellcasting classes
-            if len(spellcasting_classes) >= 1:
-                primary = spellcasting_classes[0]
-                ability = primary['ability']
-                modifier = self.get_ability_modifier(ability)
-                field_data.update({
-                    'Spellcasting Class': primary['name'],
-                    'SpellcastingAbility': ability.upper()[:3],  # First three letters capitalized
-                    'SpellSaveDC': str(8 + self.properties['proficiency_bonus'] + modifier),
-                    'SpellAtkBonus': f"+{modifier + self.properties['proficiency_bonus']}"
-                })
+                    spellcasting_classes.append((class_info['name'], class_data['spellcasting']['ability']))
+                    if len(spellcasting_classes) == len(_PDF_SPELLCASTING_FIELDS):
+                        break
 
-            if len(spellcasting_classes) >= 2:
-                secondary = spellcasting_classes[1]
-                ability = secondary['ability']
-                modifier = self.get_ability_modifier(ability)
+            for (class_field, ability_field, dc_field, attack_field), (class_name, ability) in zip(
+                    _PDF_SPELLCASTING_FIELDS, spellcasting_classes):
+                modifier = mods.get(ability.lower())
+                if modifier is None:
+                    modifier = self.get_ability_modifier(ability)
                 field_data.update({
-                    'Spellcasting Class 2': secondary['name'],
-                    'SpellcastingAbility 2': ability.upper()[:3],  # First three letters capitalized
-                    'SpellSaveDC  2': str(8 + self.properties['proficiency_bonus'] + modifier),  # Note: two spaces in field name
-                    'SpellAtkBonus 2': f"+{modifier + self.properties['proficiency_bonus']}"
+                    class_field: class_name,
+                    ability_field: ability.upper()[:3],  # First three letters capitalized
+                    dc_field: str(8 + prof_bonus + modifier),
+                    attack_field: _signed(modifier + prof_bonus)
                 })
-                
-            # Save the FDF file
-            fdf_path = os.path.join(tempfile.gettempdir(), f"{self.properties['name'].replace(' ', '_')}_sheet.fdf")
-            
-            # Ensure temp directory exists and is writable
-            temp_dir = os.path.dirname(fdf_path)
-            if not os.path.exists(temp_dir):
-                os.makedirs(temp_dir)
             
-            try:
-                with open(fdf_path, 'w', encoding='utf-8') as f:
-                    f.write("%FDF-1.2\n")
-                    f.write("1 0 obj\n")
-                    f.write("<<\n")
-                    f.write("/FDF\n")
-                    f.write("<<\n")
-                    f.write("/Fields [\n")
-                    
-                    for field_name, value in field_data.items():
-                        # Convert value to string and handle newlines
-                        value_str = str(value)
-                        
-                        # Replace literal \n with actual newlines, then escape for FDF
-                        if '\\n' in value_str:
-                            value_str = value_str.replace('\\n', '\n')
-                        
-                        # Properly escape special characters for FDF
-                        value_str = value_str.replace('\\', '\\\\')
-                        value_str = value_str.replace('(', '\\(')
-                        value_str = value_str.replace(')', '\\)')
-                        value_str = value_str.replace('\n', '\\r')  # Use \r for newlines in FDF
-                        
-                        # Write field entry
-                        f.write("<<\n")
-                        f.write(f"/T ({field_name})\n")
-                        f.write(f"/V ({value_str})\n")
-                        f.write(">>\n")
-                    
-                    f.write("]\n")
-                    f.write(">>\n")
-                    f.write(">>\n")  # Close the first dictionary
-                    f.write("endobj\n")
-                    f.write("trailer\n")
-                    f.write("<<\n")
-                    f.write("/Root 1 0 R\n")
-                    f.write(">>\n")
-                    f.write("%%EOF\n")
-                    
-                    # Ensure file is properly flushed and synced
-                    f.flush()
-                    os.fsync(f.fileno())
+            # Skip names the template lacks rather than sending fields nothing will fill
+            template_fields = _template_field_names(template_path)
+            if template_fields:
+                field_data = {name: value for name, value in field_data.items() if name in template_fields}
                 
-                # Verify the file exists and has content
-                if not os.path.exists(fdf_path) or os.path.getsize(fdf_path) == 0:
-                    raise CharacterError("Failed to create FDF file")
+            # Fill a uniquely named temporary file and rename it, so a failed fill
+            # never leaves a half-written sheet and concurrent exports never share it
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path), suffix=".pdf.tmp")
+            os.close(fd)
+            try:
+                # pdftk produces a flattened sheet; without it, fill the form in-process
+                if shutil.which('pdftk') is None:
+                    logger.info("pdftk not found, filling PDF form with PyPDF2")
+                    _fill_pdf_form(template_path, field_data, tmp_path)
+                    os.replace(tmp_path, output_path)
+                    return output_path
                 
-                # Run pdftk with error output capture
+                # Build the FDF form data in memory
+                parts = []
+                for field_name, value in field_data.items():
+                    # Replace literal \n with actual newlines before encoding for FDF
+                    value_str = str(value).replace('\\n', '\n')
+                    parts.append(f"<<\n/T ({field_name})\n/V {_fdf_value(value_str)}\n>>\n")
+                fdf = _FDF_HEADER + "".join(parts).encode('utf-8') + _FDF_TRAILER
+            
+                # Pipe the FDF to pdftk on stdin, with error output capture
                 try:
-                    result = subprocess.run([
+                    subprocess.run([
                         'pdftk',
                         template_path,
                         'fill_form',
-                        fdf_path,
+                        '-',
                         'output',
-                        output_path,
+                        tmp_path,
                         'flatten'
-                    ], capture_output=True, text=True, check=True)
-                    
-                    # Clean up the temporary FDF file
-                    try:
-                        os.unlink(fdf_path)
-                    except Exception as e:
-                        logger.warning(f"Failed to clean up FDF file: {e}")
-                    
+                    ], input=fdf, capture_output=True, check=True)
+                
+                    os.replace(tmp_path, output_path)
                     return output_path
-                    
+                
                 except subprocess.CalledProcessError as e:
-                    logger.error(f"pdftk stderr: {e.stderr}")
-                    logger.error(f"pdftk stdout: {e.stdout}")
-                    raise CharacterError(f"pdftk failed: {e.stderr}")
-                    
-            except Exception as e:
-                logger.error(f"Failed to create or write FDF file: {e}")
-                raise CharacterError(f"Failed to create FDF file: {e}")
+                    stderr = e.stderr.decode('utf-8', errors='replace')
+                    logger.error(f"pdftk stderr: {stderr}")
+                    logger.error(f"pdftk stdout: {e.stdout.decode('utf-8', errors='replace')}")
+                    raise CharacterError(f"pdftk failed: {stderr}")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
         except Exception as e:
             logger.error(f"Failed to export PDF character sheet: {e}")
             raise CharacterError(f"Failed to export PDF character sheet: {e}")
@@ -1766,7 +1985,7 @@ class Toon:
             Total skill bonus including ability modifier and proficiency
         """
         skill = skill.lower()  # Normalize skill name
-        ability = self._get_skill_ability(skill)
+        ability = _SKILL_ABILITIES.get(skill, 'intelligence')
         bonus = self.get_ability_modifier(ability)
         if self.properties['skills'].get(skill, False):
             bonus += self.properties['proficiency_bonus']
@@ -1933,11 +2152,9 @@ class Toon:
             - String formatted as "n" for single die type or "n/m" for multiple die types
             - String formatted as "1dn" for single die type or "1dn, 1dm" for multiple
         """
-        hit_dice_counts = defaultdict(int)
-        for die in self.properties['hit_dice']:
-            die_type = die.split('d')[1]  # Extract the die type (e.g., '10' from '1d10')
-            hit_dice_counts[die_type] += 1
-        
+        # Count dice by type (e.g., '10' from '1d10')
+        hit_dice_counts = Counter(die.rpartition('d')[2] for die in self.properties['hit_dice'])
+
         # Sort by die size (d4, d6, d8, etc.)
         sorted_dice = sorted(hit_dice_counts.items(), key=lambda x: int(x[0]))
         
@@ -1970,7 +2187,7 @@ class Toon:
             mechanics_type = mechanics.get('type', '')
             
             # Features with these mechanics types are always combat
-            if mechanics_type in ['action', 'reaction', 'bonus_action']:
+            if mechanics_type in _COMBAT_ACTION_TYPES:
                 return 'combat'
                 
             # Features with damage, attack rolls, or saves are combat
@@ -1986,65 +2203,28 @@ class Toon:
                 if any(k in mechanics for k in ['skill', 'tool', 'social']):
                     return 'non_combat'
         
-        # Combat-related keywords that strongly indicate a combat feature
-        combat_keywords = [
-            "attack roll", "damage", "hit points", "AC", "armor class",
-            "initiative", "reaction", "bonus action", "weapon",
-            "resistance", "immunity", "spell attack", "combat",
-            "defense", "shield", "dodge", "critical", "temporary hp",
-            "martial", "maneuver", "rage", "smite", "sneak attack",
-            "fighting style", "proficiency with", "disadvantage on attack",
-            "advantage on attack"
-        ]
-        
-        # Non-combat keywords that strongly indicate a non-combat feature
-        non_combat_keywords = [
-            "skill", "social", "interact", "craft", "create",
-            "explore", "investigate", "survival", "culture",
-            "background", "knowledge", "profession", "lifestyle",
-            "residence", "ceremony", "meditation", "study",
-            "tracking", "recall information", "familiar with",
-            "environment", "healing", "care", "temple", "shrine"
-        ]
-
-        # Special case names that are always combat
-        combat_names = {
-            "fighting style", "martial", "weapon training", "armor training",
-            "divine smite", "sneak attack", "rage", "martial arts",
-            "extra attack", "unarmored defense", "defensive tactics"
-        }
-
-        # Special case names that are always non-combat
-        non_combat_names = {
-            "darkvision", "superior darkvision", "keen senses", "trance",
-            "shelter of the faithful", "natural explorer", "favored enemy",
-            "languages", "tool proficiency", "skill proficiency"
-        }
-
         name = feature.get('name', '').lower()
         
         # Check special case names first
-        if any(combat_name in name for combat_name in combat_names):
+        if any(combat_name in name for combat_name in _COMBAT_NAMES):
             return 'combat'
-        if any(non_combat_name in name for non_combat_name in non_combat_names):
+        if any(non_combat_name in name for non_combat_name in _NON_COMBAT_NAMES):
             return 'non_combat'
         
         # Combine name and description for text analysis
-        text = (name + ' ' + feature.get('description', '')).lower()
+        text = name + ' ' + feature.get('description', '').lower()
         
         # Count keyword matches
-        combat_matches = sum(1 for keyword in combat_keywords if keyword in text)
-        non_combat_matches = sum(1 for keyword in non_combat_keywords if keyword in text)
+        combat_matches = sum(1 for keyword in _COMBAT_KEYWORDS if keyword in text)
+        non_combat_matches = sum(1 for keyword in _NON_COMBAT_KEYWORDS if keyword in text)
         
         # Special case handling for spells and magic
         if "spell" in text or "magic" in text or "casting" in text:
             # Look for combat spell indicators
-            combat_spell_indicators = ["damage", "attack", "hit", "defense", "weapon"]
-            if any(indicator in text for indicator in combat_spell_indicators):
+            if any(indicator in text for indicator in _COMBAT_SPELL_INDICATORS):
                 return 'combat'
             # Look for utility spell indicators
-            utility_spell_indicators = ["utility", "light", "illusion", "communication", "travel"]
-            if any(indicator in text for indicator in utility_spell_indicators):
+            if any(indicator in text for indicator in _UTILITY_SPELL_INDICATORS):
                 return 'non_combat'
             # If unclear, default to combat for spellcasting features
             return 'combat'
@@ -2106,7 +2286,7 @@ class Toon:
                 # Determine category based on mechanics type
                 if mechanics:
                     mechanics_type = mechanics.get('type', '')
-                    if mechanics_type in ['action', 'reaction', 'bonus_action'] or 'damage' in mechanics:
+                    if mechanics_type in _COMBAT_ACTION_TYPES or 'damage' in mechanics:
                         category = 'combat'
                     elif mechanics_type in ['passive', 'resource'] and not any(k in mechanics for k in ['damage', 'attack', 'save']):
                         category = 'non_combat'
@@ -2121,7 +2301,7 @@ class Toon:
                     mechanics_type = mechanics.get('type', '')
                     
                     # Action type
-                    if mechanics_type in ['action', 'reaction', 'bonus_action']:
+                    if mechanics_type in _COMBAT_ACTION_TYPES:
                         mechanics_text.append(f"Action Type: {mechanics_type.replace('_', ' ').title()}")
                     
                     # Resource usage